@@ -0,0 +1,108 @@
+"""
+One place to look up document analyses, whichever page asks.
+
+Milestones 1-3 and the ATS page all run skill extraction / similarity /
+ATS scoring on the same resume and JD text. Results are memoized here under
+(stage, resume hash, JD hash, engine version), so each document is analysed
+once per session. The store lives in st.session_state as a plain object,
+which save_progress skips (it only persists JSON-serializable values).
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Bump when extraction or scoring logic changes meaning, so stale entries are never reused.
+ANALYSIS_ENGINE_VERSION = "1"
+SESSION_KEY = "analysis_store"
+MAX_ENTRIES = 64
+
+
+def doc_hash(text):
+    return hashlib.sha1((text or "").encode("utf-8")).hexdigest() if text else ""
+
+
+def engine_version():
+    from milestone3 import EMBEDDING_MODEL_ID
+    return f"{ANALYSIS_ENGINE_VERSION}/{EMBEDDING_MODEL_ID}"
+
+
+class AnalysisStore:
+    """Bounded LRU of analysis results keyed by document hashes."""
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, stage, resume_text="", jd_text=""):
+        return (stage, doc_hash(resume_text), doc_hash(jd_text), engine_version())
+
+    def peek(self, stage, resume_text="", jd_text=""):
+        with self._lock:
+            return self._entries.get(self.key(stage, resume_text, jd_text))
+
+    def put(self, stage, resume_text, jd_text, value):
+        key = self.key(stage, resume_text, jd_text)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, stage, resume_text, jd_text, compute):
+        key = self.key(stage, resume_text, jd_text)
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        self.misses += 1
+        value = compute()
+        self.put(stage, resume_text, jd_text, value)
+        return value
+
+    # --- Stages ---
+    def skills(self, text):
+        """(technical, soft) skills of one document (milestone2.extract_skills)."""
+        if not text:
+            return [], []
+        from milestone2 import extract_skills
+        return self.get_or_compute("skills", text, "", lambda: extract_skills(text))
+
+    def skill_lists(self, resume_text, jd_text):
+        """De-duplicated (resume skills, JD skills) in extraction order, as Milestone 3 uses them."""
+        tech_r, soft_r = self.skills(resume_text)
+        tech_j, soft_j = self.skills(jd_text)
+        return list(dict.fromkeys(tech_r + soft_r)), list(dict.fromkeys(tech_j + soft_j))
+
+    def similarity_matrix(self, resume_text, jd_text):
+        """(resume skills, JD skills, jd x resume similarity) for the two documents."""
+        def compute():
+            from milestone3 import compute_similarity_matrix
+            r_skills, j_skills = self.skill_lists(resume_text, jd_text)
+            return r_skills, j_skills, compute_similarity_matrix(r_skills, j_skills)
+        return self.get_or_compute("similarity", resume_text, jd_text, compute)
+
+    def ats_report(self, resume_text, jd_text="", tenant=None):
+        from ats_score import calculate_ats_score_realtime
+        return self.get_or_compute(f"ats:{tenant or ''}", resume_text, jd_text,
+                                   lambda: calculate_ats_score_realtime(resume_text, jd_text, tenant=tenant))
+
+
+_process_store = AnalysisStore()
+
+def get_analysis_store():
+    """The current session's store; a process-wide one outside a Streamlit session (CLI, workers)."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        if get_script_run_ctx() is None:
+            return _process_store
+        import streamlit as st
+        store = st.session_state.get(SESSION_KEY)
+        if not isinstance(store, AnalysisStore):
+            store = st.session_state[SESSION_KEY] = AnalysisStore()
+        return store
+    except ImportError:
+        return _process_store
@@ -0,0 +1,184 @@
+"""
+Offline batch ATS audit: score a folder of resumes against one JD.
+
+    python ats_batch.py resumes/ --jd jd.txt --out results.csv
+    python ats_batch.py resumes/ --jd jd.txt --out results.jsonl --workers 8
+
+Files are parsed with milestone1._parse_bytes and scored with
+ats_score.calculate_ats_score_realtime in a process pool. Each result is
+appended to the output as soon as it completes, so an interrupted run can be
+re-started with the same command and only scores the files not yet written
+(files that failed are retried).
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".doc", ".txt")
+
+CSV_COLUMNS = [
+    "file", "score", "resume_quality", "jd_match_score", "name", "email", "phone",
+    "word_count", "metrics_count", "verb_count", "failed_checks", "missing_keywords", "error",
+]
+
+
+def find_resumes(root):
+    """Sorted relative paths of every supported file under `root`."""
+    found = []
+    for dirpath, _, filenames in os.walk(root):
+        for fn in filenames:
+            if fn.lower().endswith(SUPPORTED_EXTENSIONS):
+                found.append(os.path.relpath(os.path.join(dirpath, fn), root))
+    return sorted(found)
+
+
+def completed_files(out_path):
+    """Files already scored successfully in a previous (possibly interrupted) run."""
+    if not os.path.exists(out_path):
+        return set()
+    done = set()
+    with open(out_path, "r", encoding="utf-8", newline="") as f:
+        if out_path.endswith(".jsonl"):
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue  # Torn final line from an interrupted write
+                if not row.get("error"):
+                    done.add(row["file"])
+        else:
+            for row in csv.DictReader(f):
+                # A torn final row (e.g. "resume7.pdf,8") is short of columns
+                # or has a cut-off score: treat that file as not done
+                if None in row or any(row.get(c) is None for c in CSV_COLUMNS):
+                    continue
+                try:
+                    float(row["score"])
+                except ValueError:
+                    continue
+                if row["file"] and not row["error"]:
+                    done.add(row["file"])
+    return done
+
+
+def _init_worker():
+    # One torch thread per process; the pool provides the parallelism
+    os.environ.setdefault("SKILLGAP_TORCH_THREADS", "1")
+
+
+def score_file(root, rel_path, jd_text, max_pages=5, tenant=None):
+    """Worker: parse + score one file. Never raises; errors are returned in the row."""
+    try:
+        from milestone1 import _parse_bytes
+        from ats_score import calculate_ats_score_realtime
+
+        with open(os.path.join(root, rel_path), "rb") as f:
+            data = f.read()
+        # Bypass st.cache_data: every file is seen once, caching would only hold memory
+        parse = getattr(_parse_bytes, "__wrapped__", _parse_bytes)
+        text = parse(data, os.path.basename(rel_path), max_pages)
+        if not text.strip():
+            return {"file": rel_path, "error": "No extractable text"}
+        report = calculate_ats_score_realtime(text, jd_text, tenant=tenant)
+        report.pop("rule_timings_ms", None)
+        return {"file": rel_path, "error": "", **report}
+    except Exception as e:
+        return {"file": rel_path, "error": f"{type(e).__name__}: {e}"}
+
+
+def _csv_row(result):
+    row = {k: result.get(k, "") for k in CSV_COLUMNS}
+    row["failed_checks"] = "; ".join(c["name"] for c in result.get("checks", []) if not c["status"])
+    row["missing_keywords"] = "; ".join(result.get("missing_keywords", []))
+    return row
+
+
+class ResultWriter:
+    """Appends rows to CSV or JSONL, flushing after each one."""
+
+    def __init__(self, out_path):
+        self.jsonl = out_path.endswith(".jsonl")
+        is_new = not os.path.exists(out_path) or os.path.getsize(out_path) == 0
+        if not is_new:
+            # Terminate a torn last line so the next record starts cleanly
+            with open(out_path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                torn = f.read(1) != b"\n"
+        self.f = open(out_path, "a", encoding="utf-8", newline="")
+        if not is_new and torn:
+            self.f.write("\n")
+        if not self.jsonl:
+            self.csv = csv.DictWriter(self.f, fieldnames=CSV_COLUMNS)
+            if is_new:
+                self.csv.writeheader()
+
+    def write(self, result):
+        if self.jsonl:
+            self.f.write(json.dumps(result, default=str) + "\n")
+        else:
+            self.csv.writerow(_csv_row(result))
+        self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+
+def run(root, jd_text, out_path, workers=None, max_pages=5, tenant=None):
+    files = find_resumes(root)
+    done = completed_files(out_path)
+    todo = [f for f in files if f not in done]
+    print(f"{len(files)} resumes found, {len(done)} already scored, {len(todo)} to go.", file=sys.stderr)
+    if not todo:
+        return 0
+
+    workers = workers or os.cpu_count() or 1
+    writer = ResultWriter(out_path)
+    started, finished, failed = time.perf_counter(), 0, 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            # Keep a bounded number of tasks in flight so huge folders don't
+            # queue every file (and its result) in memory at once.
+            pending, queue = set(), iter(todo)
+            for rel_path in queue:
+                pending.add(pool.submit(score_file, root, rel_path, jd_text, max_pages, tenant))
+                if len(pending) >= workers * 4:
+                    break
+            while pending:
+                completed, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in completed:
+                    result = fut.result()
+                    writer.write(result)
+                    finished += 1
+                    failed += bool(result["error"])
+                    nxt = next(queue, None)
+                    if nxt is not None:
+                        pending.add(pool.submit(score_file, root, nxt, jd_text, max_pages, tenant))
+                if finished % 50 == 0 or not pending:
+                    rate = finished / (time.perf_counter() - started)
+                    print(f"  {finished}/{len(todo)} scored ({failed} failed, {rate:.1f} files/s)", file=sys.stderr)
+    finally:
+        writer.close()
+    return failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch ATS scoring of a resume folder against a JD.")
+    parser.add_argument("input", help="Folder of resumes (.pdf, .docx, .doc, .txt), searched recursively")
+    parser.add_argument("--jd", default="", help="Job description file (or literal text); omit for quality-only scoring")
+    parser.add_argument("--out", required=True, help="Output file: .csv or .jsonl (appended to, resumable)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--max-pages", type=int, default=5)
+    parser.add_argument("--tenant", default=None, help="Tenant whose ATS rule set to apply (see ats_rules)")
+    args = parser.parse_args()
+
+    jd_text = args.jd
+    if jd_text and os.path.isfile(jd_text):
+        with open(jd_text, "r", encoding="utf-8") as f:
+            jd_text = f.read()
+
+    failed = run(args.input, jd_text, args.out, args.workers, args.max_pages, args.tenant)
+    sys.exit(1 if failed else 0)
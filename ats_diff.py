@@ -0,0 +1,182 @@
+"""
+ATS diff between two versions of a resume.
+
+Both versions are split into content-defined blocks of lines: a block ends
+at a blank line or at a line whose hash falls on a boundary, so editing or
+inserting a line only changes the block(s) around it and every other block
+keeps its hash. Block profiles and extracted skills are cached by that hash
+in the differ itself, the cheap aggregate checks are re-evaluated on the
+combined profile, and the result reports which checks flipped, the score
+delta and the keyword changes. Diffing v2 against v1 only profiles the text
+that differs.
+
+    differ = ATSDiffer()
+    d = differ.diff(old_text, new_text, jd_text)
+    d["score_delta"], d["flipped"], d["keywords"]["added"]
+
+Versions can also be Resume Builder cv dicts (split with live_ats.cv_sections).
+"""
+import hashlib
+import time
+from collections import OrderedDict
+
+from ats_rules import DocumentProfile, get_engine, quality_score
+from live_ats import SectionProfileCache, cv_sections
+
+# Average block length in lines (boundary when a line's hash % BLOCK_LINES == 0)
+BLOCK_LINES = 8
+BLOCK_CACHE_SIZE = 512
+SNAPSHOT_CACHE_SIZE = 16
+
+
+def _hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def split_blocks(text):
+    """Content-defined line blocks; "\\n".join(blocks) == text."""
+    blocks, current = [], []
+    for line in (text or "").split("\n"):
+        current.append(line)
+        stripped = line.strip()
+        if not stripped or int(_hash(stripped)[:8], 16) % BLOCK_LINES == 0:
+            blocks.append("\n".join(current))
+            current = []
+    if current:
+        blocks.append("\n".join(current))
+    return blocks
+
+
+class ATSDiffer:
+    """Caches block profiles, block skills and whole-version snapshots; keep one per session."""
+
+    def __init__(self, tenant=None, keywords=True):
+        self.tenant = tenant
+        self.keywords = keywords
+        self._profiles = SectionProfileCache(BLOCK_CACHE_SIZE)
+        self._block_skills = OrderedDict()  # block hash -> lower-cased skills
+        self._snapshots = OrderedDict()  # version hash -> snapshot
+
+    def _blocks(self, version):
+        if isinstance(version, dict):
+            return list(cv_sections(version).items())
+        return [("block", b) for b in split_blocks(version)]
+
+    def _block_keywords(self, blocks):
+        """
+        Lower-cased skills of the blocks, extracted once per block hash; None if
+        NLP is unavailable. Kept here rather than in analysis_store, whose small
+        per-session LRU holds whole-document analyses.
+        """
+        if not self.keywords:
+            return None
+        try:
+            from milestone2 import extract_skills
+            found = set()
+            for _, text in blocks:
+                if not text.strip():
+                    continue
+                key = _hash(text)
+                skills = self._block_skills.get(key)
+                if skills is None:
+                    tech, soft = extract_skills(text)
+                    skills = self._block_skills[key] = frozenset(s.lower() for s in tech + soft)
+                    if len(self._block_skills) > BLOCK_CACHE_SIZE:
+                        self._block_skills.popitem(last=False)
+                else:
+                    self._block_skills.move_to_end(key)
+                found.update(skills)
+            return found
+        except Exception:
+            return None
+
+    def snapshot(self, version):
+        """
+        {"score", "checks", "keywords", "blocks", "recomputed"} for one version;
+        `recomputed` counts the blocks that were not already cached.
+        """
+        blocks = self._blocks(version)
+        key = _hash(repr(blocks))
+        snap = self._snapshots.get(key)
+        if snap is not None:
+            self._snapshots.move_to_end(key)
+            return dict(snap, recomputed=0)
+
+        parts, recomputed = [], 0
+        for name, text in blocks:
+            profile, fresh = self._profiles.get(name, text)
+            parts.append(profile)
+            recomputed += fresh
+
+        profile = DocumentProfile.combine(parts)
+        checks, raw_score, max_score, _ = get_engine(self.tenant).evaluate(profile)
+        snap = {
+            "score": quality_score(raw_score, max_score, profile.section_presence),
+            "checks": checks,
+            "keywords": self._block_keywords(blocks),
+            "blocks": len(blocks),
+        }
+        self._snapshots[key] = snap
+        if len(self._snapshots) > SNAPSHOT_CACHE_SIZE:
+            self._snapshots.popitem(last=False)
+        return dict(snap, recomputed=recomputed)
+
+    def _jd_keywords(self, jd_text):
+        if not jd_text or not self.keywords:
+            return None
+        try:
+            from analysis_store import get_analysis_store
+            tech, soft = get_analysis_store().skills(jd_text)
+            return set(s.lower() for s in tech + soft)
+        except Exception:
+            return None
+
+    def diff(self, old, new, jd_text=""):
+        """
+        {"score_old", "score_new", "score_delta", "flipped", "fixed", "regressed",
+         "keywords", "blocks_total", "blocks_recomputed", "elapsed_ms"}
+
+        `flipped` lists every check whose pass/fail status changed, with its
+        new feedback. `keywords` is None when skill extraction is unavailable;
+        otherwise {"added", "removed"} plus, when a JD is given,
+        {"jd_gained", "jd_lost", "jd_missing", "coverage_old", "coverage_new"}.
+        """
+        t0 = time.perf_counter()
+        before, after = self.snapshot(old), self.snapshot(new)
+
+        old_checks = {c["id"]: c for c in before["checks"]}
+        flipped = []
+        for c in after["checks"]:
+            prev = old_checks.get(c["id"])
+            if prev is not None and prev["status"] != c["status"]:
+                flipped.append({
+                    "id": c["id"], "category": c["category"], "name": c["name"], "impact": c["impact"],
+                    "before": prev["status"], "after": c["status"], "feedback": c["feedback"],
+                })
+
+        keywords = None
+        if before["keywords"] is not None and after["keywords"] is not None:
+            old_kw, new_kw = before["keywords"], after["keywords"]
+            keywords = {"added": sorted(new_kw - old_kw), "removed": sorted(old_kw - new_kw)}
+            jd_kw = self._jd_keywords(jd_text)
+            if jd_kw:
+                keywords.update({
+                    "jd_gained": sorted((new_kw - old_kw) & jd_kw),
+                    "jd_lost": sorted((old_kw - new_kw) & jd_kw),
+                    "jd_missing": sorted(jd_kw - new_kw),
+                    "coverage_old": round(len(old_kw & jd_kw) / len(jd_kw) * 100, 1),
+                    "coverage_new": round(len(new_kw & jd_kw) / len(jd_kw) * 100, 1),
+                })
+
+        return {
+            "score_old": before["score"],
+            "score_new": after["score"],
+            "score_delta": round(after["score"] - before["score"], 1),
+            "flipped": flipped,
+            "fixed": [f["id"] for f in flipped if f["after"]],
+            "regressed": [f["id"] for f in flipped if not f["after"]],
+            "keywords": keywords,
+            "blocks_total": before["blocks"] + after["blocks"],
+            "blocks_recomputed": before["recomputed"] + after["recomputed"],
+            "elapsed_ms": (time.perf_counter() - t0) * 1000,
+        }
@@ -0,0 +1,317 @@
+"""
+Declarative ATS check registry.
+
+Every check is registered once, at import, with an id, category, display
+name, impact level and a predicate over a DocumentProfile. The profile does
+all tokenizing/regex work up front, so the engine evaluates every enabled
+check in a single pass over shared data and times each one.
+
+Tenants can switch checks off through a JSON file (SKILLGAP_ATS_RULES):
+
+    {"acme": {"disabled": ["content.cliches", "formatting.bullets"]}}
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+from readability import ReadabilityStats, readability
+from lexicon import LexiconMatcher, load_lexicons, summarize, token_spans
+from text_patterns import SECTION_PATTERNS, SENTENCE_SPLIT_RE, WORD_RE, Span, extract_entities, first_text
+
+logger = logging.getLogger(__name__)
+
+WEIGHTS = {"Critical": 12.0, "High": 6.0, "Medium": 3.0, "Low": 1.0}
+
+ATS_RULES_FILE = os.environ.get("SKILLGAP_ATS_RULES", "ats_rules.json")
+
+# -------------------------------------------------------
+# DOCUMENT PROFILE
+# -------------------------------------------------------
+STRONG_VERBS = ["architected", "developed", "led", "managed", "analyzed", "created", "designed", "implemented", "optimized", "spearheaded", "built", "engineered", "orchestrated", "pioneered", "delivered", "championed", "transformed", "reduced", "increased"]
+CLICHES = ["hard worker", "team player", "think outside the box", "go getter", "detail oriented", "responsible for", "duties included", "best of breed"]
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+def get_matcher():
+    """Phrase index over the built-in "verbs" / "cliches" lexicons plus the lexicon file, built once."""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = LexiconMatcher(load_lexicons({"verbs": STRONG_VERBS, "cliches": CLICHES}))
+    return _matcher
+
+
+class DocumentProfile:
+    """Everything the checks look at, computed once per resume text."""
+
+    def __init__(self, resume_text):
+        self.text = resume_text
+        clean_text = resume_text.strip()
+        self.lower = clean_text.lower()
+        self.words = WORD_RE.findall(self.lower)
+        self.word_count = len(self.words)
+        sentences = SENTENCE_SPLIT_RE.split(clean_text)
+        self.sentence_count = len(sentences)
+        self.sentence_words = sum(len(s.split()) for s in sentences)
+        self.avg_sentence_len = self.sentence_words / self.sentence_count if sentences else 0
+        self.readability = readability(resume_text)  # Flesch / Fog / passive / bullets, cached by hash
+
+        lines = [l.strip() for l in clean_text.split('\n') if l.strip()]
+        name = lines[0] if lines else "Candidate"
+        if len(name) > 40 or "@" in name or len(name.split()) > 6:
+            name = "Candidate"
+        self.candidate_name = name
+
+        self.entities = extract_entities(resume_text)  # emails, phones, metrics with offsets
+        self.email = first_text(self.entities["email"])
+        self.phone = first_text(self.entities["phone"])
+
+        self.section_presence = {sec: bool(p.search(self.lower)) for sec, p in SECTION_PATTERNS.items()}
+        self.bullet_count = resume_text.count('•') + resume_text.count('- ') + resume_text.count('* ')
+        self.metrics = self.entities["metric"]
+
+        # One pass over the tokens for every lexicon (token positions; see lexicon_spans)
+        self.lexicon_hits = summarize(get_matcher().match_tokens(self.words))
+        self._set_lexicon_findings()
+
+    def _set_lexicon_findings(self):
+        found = {name: set(e for e, _, _ in hits["positions"]) for name, hits in self.lexicon_hits.items()}
+        entries = get_matcher().lexicons
+        self.found_verbs = [v for v in entries["verbs"] if v in found["verbs"]]
+        self.found_cliches = [c for c in entries["cliches"] if c in found["cliches"]]
+
+    def lexicon_spans(self):
+        """lexicon_hits with (entry, start, end) character offsets into `text`, for highlighting."""
+        spans = token_spans(self.text)
+        return {name: dict(hits, positions=[(e, spans[a][1], spans[b][2]) for e, a, b in hits["positions"]])
+                for name, hits in self.lexicon_hits.items()}
+
+    @classmethod
+    def combine(cls, parts):
+        """
+        Profile of the newline-joined texts of `parts` (already profiled
+        sections), without re-scanning them. Matches that would only exist
+        across a section boundary are not found.
+        """
+        parts = [p for p in parts if p.text.strip()]
+        profile = cls.__new__(cls)
+        profile.text = "\n".join(p.text for p in parts)
+        profile.lower = "\n".join(p.lower for p in parts)
+        profile.words = [w for p in parts for w in p.words]
+        profile.word_count = len(profile.words)
+        # Each section boundary merges its last sentence fragment with the next one's first
+        profile.sentence_count = max(1, sum(p.sentence_count for p in parts) - max(0, len(parts) - 1))
+        profile.sentence_words = sum(p.sentence_words for p in parts)
+        profile.avg_sentence_len = profile.sentence_words / profile.sentence_count
+        profile.readability = ReadabilityStats.combine([p.readability for p in parts])
+        profile.candidate_name = parts[0].candidate_name if parts else "Candidate"
+
+        profile.entities = {"email": [], "phone": [], "metric": []}
+        offset = 0
+        for p in parts:
+            for kind, spans in p.entities.items():
+                profile.entities[kind].extend(Span(s.kind, s.text, s.start + offset, s.end + offset) for s in spans)
+            offset += len(p.text) + 1
+        profile.email = first_text(profile.entities["email"])
+        profile.phone = first_text(profile.entities["phone"])
+
+        profile.section_presence = {sec: any(p.section_presence[sec] for p in parts) for sec in SECTION_PATTERNS}
+        profile.bullet_count = sum(p.bullet_count for p in parts)
+        profile.metrics = profile.entities["metric"]
+
+        hits = {name: [] for name in get_matcher().lexicons}
+        shift = 0
+        for p in parts:
+            for name, found in p.lexicon_hits.items():
+                hits[name].extend((e, a + shift, b + shift) for e, a, b in found["positions"])
+            shift += p.word_count
+        profile.lexicon_hits = summarize(hits)
+        profile._set_lexicon_findings()
+        return profile
+
+
+# -------------------------------------------------------
+# REGISTRY
+# -------------------------------------------------------
+class Check:
+    """A registered rule. `predicate(profile)` returns (status, feedback[, impact override])."""
+    __slots__ = ("id", "category", "name", "impact", "predicate")
+
+    def __init__(self, id, category, name, impact, predicate):
+        if impact not in WEIGHTS:
+            raise ValueError(f"Unknown impact '{impact}' for check {id}")
+        self.id = id
+        self.category = category
+        self.name = name
+        self.impact = impact
+        self.predicate = predicate
+
+
+REGISTRY = {}
+
+def rule(id, category, name, impact="Medium"):
+    """Decorator registering a check predicate under `id`."""
+    def register(predicate):
+        if id in REGISTRY:
+            raise ValueError(f"Duplicate ATS check id: {id}")
+        REGISTRY[id] = Check(id, category, name, impact, predicate)
+        return predicate
+    return register
+
+
+# --- 1. KO FACTORS (KNOCK-OUT) ---
+@rule("essentials.email", "Essentials", "Email Verification", "Critical")
+def _email(p):
+    if p.email != "N/A":
+        return True, f"Verified: {p.email}"
+    return False, "Missing Email. **Auto-Reject Risk**."
+
+@rule("essentials.phone", "Essentials", "Phone Verification", "Critical")
+def _phone(p):
+    found = p.phone != "N/A"
+    return found, "Contact number detected." if found else "No phone detected."
+
+@rule("formatting.readability", "Formatting", "Machine Readability", "Critical")
+def _readability(p):
+    return True, "Text layer is selectable."
+
+# --- 2. STRUCTURAL INTEGRITY ---
+def _section_rule(sec):
+    def predicate(p):
+        found = p.section_presence[sec]
+        return found, f"Found standard header: {sec}" if found else f"Missing Section: {sec}"
+    return predicate
+
+for _sec in SECTION_PATTERNS:
+    rule(f"structure.{_sec.lower()}", "Structure", f"{_sec} Detected",
+         "Critical" if _sec in ["Experience", "Education"] else "High")(_section_rule(_sec))
+
+# --- 3. FORMATTING HYGIENE ---
+@rule("formatting.word_count", "Formatting", "Word Count", "High")
+def _word_count(p):
+    if 450 <= p.word_count <= 1200:
+        return True, f"Optimal volume ({p.word_count} words)."
+    if p.word_count < 450:
+        return False, f"Too brief ({p.word_count} words). Low context."
+    return False, f"Too lengthy ({p.word_count} words). Risk of truncation.", "Medium"
+
+@rule("formatting.bullets", "Formatting", "Bulletization", "High")
+def _bullets(p):
+    if p.bullet_count > 15:
+        return True, "High readability via bullets."
+    return False, "Text block heavy. Use more bullets."
+
+# --- 4. CONTENT QUALITY ---
+@rule("content.metrics", "Content", "Quantifiable Impact", "High")
+def _metrics(p):
+    n = len(p.metrics)
+    if n >= 6:
+        return True, f"Strong data usage ({n} metrics)."
+    if n >= 3:
+        return False, f"Weak data usage ({n} metrics). Goal: 6+"
+    return False, "No quantified achievements found.", "Critical"
+
+@rule("content.verbs", "Content", "Action Verbs", "High")
+def _verbs(p):
+    if len(p.found_verbs) >= 6:
+        return True, f"Dynamic vocabulary ({len(p.found_verbs)} unique)."
+    return False, "Passive voice detected. Use strong verbs."
+
+@rule("content.cliches", "Content", "Cliché Check", "Medium")
+def _cliches(p):
+    if not p.found_cliches:
+        return True, "Professional, direct tone."
+    return False, f"Remove fillers: {', '.join(p.found_cliches[:2])}"
+
+
+# -------------------------------------------------------
+# ENGINE
+# -------------------------------------------------------
+class RuleEngine:
+    """An ordered, pre-filtered tuple of checks plus cumulative per-check timings."""
+
+    def __init__(self, disabled=()):
+        disabled = set(disabled)
+        unknown = disabled - set(REGISTRY)
+        if unknown:
+            # A typo (or a check removed since) in a tenant's rules file must
+            # not take down scoring for that tenant: skip it, but say so
+            logger.warning("Ignoring unknown ATS check ids in disabled list: %s", sorted(unknown))
+        self.checks = tuple(c for c in REGISTRY.values() if c.id not in disabled)
+        self.timings = {c.id: [0, 0.0] for c in self.checks}  # id -> [calls, total ms]
+        self._lock = threading.Lock()
+
+    def evaluate(self, profile):
+        """Runs every enabled check once. Returns (checks, raw_score, max_score, timings_ms)."""
+        results, timings = [], {}
+        raw_score = max_score = 0.0
+        clock = time.perf_counter
+        for check in self.checks:
+            t0 = clock()
+            status, feedback, *override = check.predicate(profile)
+            timings[check.id] = (clock() - t0) * 1000
+
+            impact = override[0] if override else check.impact
+            weight = WEIGHTS[impact]
+            # Every check counts towards the maximum, passing ones towards the score
+            max_score += weight
+            if status:
+                raw_score += weight
+            results.append({
+                "id": check.id, "category": check.category, "name": check.name,
+                "status": status, "feedback": feedback, "impact": impact
+            })
+
+        with self._lock:
+            for cid, ms in timings.items():
+                self.timings[cid][0] += 1
+                self.timings[cid][1] += ms
+        return results, raw_score, max_score, timings
+
+    def timing_report(self):
+        """{check id: mean ms per evaluation}."""
+        with self._lock:
+            return {cid: total / calls for cid, (calls, total) in self.timings.items() if calls}
+
+
+def quality_score(raw_score, max_score, section_presence):
+    """0-100 resume quality from check weights, with hard caps for missing core sections."""
+    score = (raw_score / max_score) * 100 if max_score > 0 else 0
+    
+    # Penalties for MISSING CRITICAL SECTIONS (The "Real" ATS Logic)
+    # Even if you have good keywords, if you have no Experience section, you are out.
+    if not section_presence["Experience"]:
+        score = min(score, 45) # Hard Cap
+    
+    if not section_presence["Education"] and not section_presence["Skills"]:
+        score = min(score, 50) # Hard Cap
+
+    return round(min(100.0, score), 1)
+
+
+def load_tenant_config(path=ATS_RULES_FILE):
+    """{tenant: {"disabled": [check ids]}} from the rules file, {} when absent."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+def get_engine(tenant=None):
+    """Compiled engine for `tenant` (None = every check enabled), built once per tenant."""
+    engine = _engines.get(tenant)
+    if engine is None:
+        with _engines_lock:
+            engine = _engines.get(tenant)
+            if engine is None:
+                disabled = load_tenant_config().get(tenant, {}).get("disabled", []) if tenant else []
+                engine = _engines[tenant] = RuleEngine(disabled)
+    return engine
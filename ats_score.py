@@ -10,8 +10,8 @@ import pdf_gen
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import re
 import time
+from single_flight import single_flight
 import random
 import numpy as np
 from collections import Counter
@@ -32,164 +32,45 @@ def load_lottieurl(url: str):
 # -------------------------------------------------------
 # CORE LOGIC
 # -------------------------------------------------------
-def calculate_ats_score_realtime(resume_text, jd_text=""):
+@single_flight
+def calculate_ats_score_realtime(resume_text, jd_text="", tenant=None):
     """
     Simulates a Real-Time Enterprise ATS Scoring Engine.
     Uses strict penalties for missing sections and heavily weighs JD overlap.
+    Checks come from the ats_rules registry; `tenant` selects its enabled set.
     """
-    raw_score = 0.0 
-    checks = [] # {category, check, status (bool), feedback, impact (high/med/low)}
-    
-    clean_text = resume_text.strip()
-    resume_lower = clean_text.lower()
-    words = re.findall(r'\w+', resume_lower)
-    word_count = len(words)
-    sentences = re.split(r'[.!?]+', clean_text)
-    avg_sentence_len = sum(len(s.split()) for s in sentences) / len(sentences) if sentences else 0
-
-    # --- CONSTANTS & SCORING WEIGHTS ---
-    WEIGHTS = {"Critical": 12.0, "High": 6.0, "Medium": 3.0, "Low": 1.0}
-    MAX_POSSIBLE_SCORE = 0.0 
-
-    def add_check(cat, name, status, feedback, impact="Medium"):
-        nonlocal raw_score, MAX_POSSIBLE_SCORE
-        weight = WEIGHTS.get(impact, 1.0)
-        
-        # We always add to max_possible to calculate percentage later
-        MAX_POSSIBLE_SCORE += weight
-        
-        if status:
-            raw_score += weight
-        
-        checks.append({
-            "category": cat, "name": name, "status": status, 
-            "feedback": feedback, "impact": impact
-        })
-
-    # --- DATA EXTRACTION ---
-    lines = [l.strip() for l in clean_text.split('\n') if l.strip()]
-    candidate_name = lines[0] if lines else "Candidate"
-    if len(candidate_name) > 40 or "@" in candidate_name or len(candidate_name.split()) > 6:
-        candidate_name = "Candidate"
-        
-    emails = re.findall(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', resume_text)
-    email_found = emails[0] if emails else "N/A"
-
-    phone_pattern = r'(\+?\d{1,3}[-.\s]?)?(\(?\d{3}\)?[-.\s]?)?\d{3}[-.\s]?\d{4}'
-    phones = re.findall(phone_pattern, resume_text)
-    valid_phones = []
-    if phones:
-        matches = re.finditer(phone_pattern, resume_text)
-        for m in matches:
-            p_text = m.group(0).strip()
-            if len(re.sub(r'\D', '', p_text)) >= 10: 
-                valid_phones.append(p_text)
-    phone_found = valid_phones[0] if valid_phones else "N/A"
-
-    # --- 1. KO FACTORS (KNOCK-OUT) ---
-    # Real ATS rejects immediately if contact info or basic formatting is unusable.
-    # We won't stop execution, but we'll flag them as Critical.
-    
-    # 1.1 Contact Info
-    if email_found != "N/A":
-        add_check("Essentials", "Email Verification", True, f"Verified: {email_found}", "Critical")
-    else:
-        add_check("Essentials", "Email Verification", False, "Missing Email. **Auto-Reject Risk**.", "Critical")
-
-    pattern_phone = phone_found != "N/A"
-    add_check("Essentials", "Phone Verification", pattern_phone, 
-              "Contact number detected." if pattern_phone else "No phone detected.", "Critical")
-              
-    # 1.2 Parsing Readability
-    add_check("Formatting", "Machine Readability", True, "Text layer is selectable.", "Critical")
-
-    # --- 2. STRUCTURAL INTEGRITY ---
-    sections = {
-        "Experience": r"(work|professional|relevant|industry)\s+experience|employment\s+history|work\s+history",
-        "Education": r"education|academic|qualification|university",
-        "Skills": r"skills|technical\s+skills|expertise|competencies|technologies",
-        "Projects": r"projects|portfolio|personal\s+projects"
-    }
-    section_presence = {}
-    for sec, pattern in sections.items():
-        found = bool(re.search(pattern, resume_lower))
-        section_presence[sec] = found
-        impact = "Critical" if sec in ["Experience", "Education"] else "High"
-        add_check("Structure", f"{sec} Detected", found, 
-                  f"Found standard header: {sec}" if found else f"Missing Section: {sec}", impact)
-
-    # --- 3. FORMATTING HYGIENE ---
-    if 450 <= word_count <= 1200:
-        add_check("Formatting", "Word Count", True, f"Optimal volume ({word_count} words).", "High")
-    elif word_count < 450:
-        add_check("Formatting", "Word Count", False, f"Too brief ({word_count} words). Low context.", "High")
-    else:
-        add_check("Formatting", "Word Count", False, f"Too lengthy ({word_count} words). Risk of truncation.", "Medium")
+    from ats_rules import DocumentProfile, get_engine, quality_score as compute_quality_score
 
-    bullet_count = resume_text.count('•') + resume_text.count('- ') + resume_text.count('* ')
-    if bullet_count > 15:
-        add_check("Formatting", "Bulletization", True, "High readability via bullets.", "High")
-    else:
-        add_check("Formatting", "Bulletization", False, "Text block heavy. Use more bullets.", "High")
-
-    # --- 4. CONTENT QUALITY ---
-    # Metrics
-    metrics = re.findall(r'(\d+(?:,\d+)*(?:\.\d+)?\s*(%|\$|M|K|\+|k|m))', resume_text)
-    metric_score = len(metrics)
-    if metric_score >= 6:
-        add_check("Content", "Quantifiable Impact", True, f"Strong data usage ({metric_score} metrics).", "High")
-    elif metric_score >= 3:
-        add_check("Content", "Quantifiable Impact", False, f"Weak data usage ({metric_score} metrics). Goal: 6+", "High")
-    else:
-        add_check("Content", "Quantifiable Impact", False, "No quantified achievements found.", "Critical")
+    profile = DocumentProfile(resume_text)
+    words = profile.words
+    section_presence = profile.section_presence
 
-    # Verbs
-    strong_verbs = ["architected", "developed", "led", "managed", "analyzed", "created", "designed", "implemented", "optimized", "spearheaded", "built", "engineered", "orchestrated", "pioneered", "delivered", "championed", "transformed", "reduced", "increased"]
-    found_verbs = list(set([v for v in strong_verbs if f" {v} " in f" {resume_lower} "]))
-    
-    if len(found_verbs) >= 6:
-        add_check("Content", "Action Verbs", True, f"Dynamic vocabulary ({len(found_verbs)} unique).", "High")
-    else:
-        add_check("Content", "Action Verbs", False, "Passive voice detected. Use strong verbs.", "High")
-
-    # Cliches
-    cliches = ["hard worker", "team player", "think outside the box", "go getter", "detail oriented", "responsible for", "duties included", "best of breed"]
-    found_cliches = [c for c in cliches if c in resume_lower]
-    if not found_cliches:
-         add_check("Content", "Cliché Check", True, "Professional, direct tone.", "Medium")
-    else:
-         add_check("Content", "Cliché Check", False, f"Remove fillers: {', '.join(found_cliches[:2])}", "Medium")
-
-    # --- CALCULATE BASE QUALITY SCORE ---
-    quality_score = (raw_score / MAX_POSSIBLE_SCORE) * 100 if MAX_POSSIBLE_SCORE > 0 else 0
-    
-    # Penalties for MISSING CRITICAL SECTIONS (The "Real" ATS Logic)
-    # Even if you have good keywords, if you have no Experience section, you are out.
-    if not section_presence["Experience"]:
-        quality_score = min(quality_score, 45) # Hard Cap
-    
-    if not section_presence["Education"] and not section_presence["Skills"]:
-        quality_score = min(quality_score, 50) # Hard Cap
+    # --- 1-4. KO FACTORS, STRUCTURE, FORMATTING, CONTENT (see ats_rules) ---
+    checks, raw_score, MAX_POSSIBLE_SCORE, rule_timings = get_engine(tenant).evaluate(profile)
 
-    quality_score = round(min(100.0, quality_score), 1)
+    # --- CALCULATE BASE QUALITY SCORE (with missing-section caps) ---
+    quality_score = compute_quality_score(raw_score, MAX_POSSIBLE_SCORE, section_presence)
 
     # --- 5. JD RELEVANCE SCORE ---
     jd_match_score = 0.0
     missing_keywords = []
     top_keywords = []
+    doc_similarity = None
     
     if jd_text and len(jd_text.strip()) > 10:
         # Import heavy NLP only if needed
         try:
-            from milestone2 import extract_skills
             from milestone3 import compute_similarity
+            from analysis_store import get_analysis_store
             
-            res_skills, _ = extract_skills(resume_text)
-            jd_skills, _ = extract_skills(jd_text)
+            # Shared with the other pages: each document is extracted once per session
+            analysis = get_analysis_store()
+            res_skills, _ = analysis.skills(resume_text)
+            jd_skills, _ = analysis.skills(jd_text)
             
             if not jd_skills:
                  # Fallback: Simple Set Intersection
-                 r_tokens = set(resume_lower.split())
+                 r_tokens = set(profile.lower.split())
                  j_tokens = set(jd_text.lower().split())
                  intersection = r_tokens & j_tokens
                  jd_match_score = (len(intersection) / len(j_tokens)) * 100 if j_tokens else 0
@@ -202,6 +83,13 @@ def calculate_ats_score_realtime(resume_text, jd_text=""):
                  # Extract top matching keywords for display
                  top_keywords = [(d['jd_skill'], 1) for d in jd_details if d['category'] == 'High Match'][:10]
 
+            # Whole-document semantic signal (reported alongside, not blended into the score)
+            try:
+                from document_similarity import document_similarity
+                doc_similarity = document_similarity(resume_text, jd_text)
+            except Exception:
+                doc_similarity = None
+
             # REAL ATS WEIGHTING: 
             # If a JD is attached, Relevance is King. 60% Stickiness.
             final_score = (quality_score * 0.4) + (jd_match_score * 0.6)
@@ -227,18 +115,22 @@ def calculate_ats_score_realtime(resume_text, jd_text=""):
         "score": round(final_score, 1),
         "resume_quality": quality_score, 
         "jd_match_score": round(jd_match_score, 1),
+        "doc_similarity": doc_similarity,
         "checks": checks,
-        "metrics_count": metric_score,
-        "verb_count": len(found_verbs),
-        "word_count": word_count,
-        "name": candidate_name,
-        "email": email_found,
-        "phone": phone_found,
+        "metrics_count": len(profile.metrics),
+        "verb_count": len(profile.found_verbs),
+        "word_count": profile.word_count,
+        "name": profile.candidate_name,
+        "email": profile.email,
+        "phone": profile.phone,
         "top_keywords": top_keywords,
         "missing_keywords": missing_keywords,
-        "cliches": found_cliches,
-        "readability_avg_len": int(avg_sentence_len),
-        "section_presence": section_presence
+        "cliches": profile.found_cliches,
+        "lexicon_hits": profile.lexicon_spans(),
+        "readability_avg_len": int(profile.avg_sentence_len),
+        "readability": profile.readability.metrics(),
+        "section_presence": section_presence,
+        "rule_timings_ms": rule_timings
     }
 
 # ----------------
@@ -385,7 +277,8 @@ def app():
                         ats_resume.seek(0)
                         raw_text = milestone1.parse_file(ats_resume)
                         # Use the new Real-Time scoring engine
-                        report = calculate_ats_score_realtime(raw_text, jd_txt)
+                        from analysis_store import get_analysis_store
+                        report = get_analysis_store().ats_report(raw_text, jd_txt)
                         
                         st.session_state["ats_report_v3"] = report
                         st.session_state["ats_page_step"] = "results"
@@ -764,6 +657,13 @@ def app():
                     r_len = report.get('readability_avg_len', 15)
                     r_status = "Excellent" if 10 <= r_len <= 20 else "Review"
                     st.info(f"**Readability Score**: Avg Sentence Length is {r_len} words. ({r_status})")
+                    rd = report.get("readability")
+                    if rd:
+                        rd1, rd2, rd3, rd4 = st.columns(4)
+                        rd1.metric("Flesch Ease", rd["flesch_reading_ease"], help="60-70 is plain English; resumes usually sit at 30-60.")
+                        rd2.metric("Fog Index", rd["gunning_fog"], help="Years of schooling needed to read the text on first pass.")
+                        rd3.metric("Passive Voice", f"{rd['passive_ratio'] * 100:.0f}%", help="Share of sentences with a passive construction.")
+                        rd4.metric("Bullet Density", f"{rd['bullet_density'] * 100:.0f}%", help="Share of content lines that are bullet points.")
                     
                     # Buzzwords
                     cliches = report.get('cliches', [])
@@ -779,6 +679,16 @@ def app():
                     v_count = report.get('verb_count', 0)
                     st.metric("Power Verbs Used", v_count, delta="Target: 6+", delta_color="normal")
 
+                    # Custom lexicons (lexicons.json), e.g. industry verbs or banned phrases
+                    extra = {k: v for k, v in report.get("lexicon_hits", {}).items() if k not in ("verbs", "cliches") and v["count"]}
+                    if extra:
+                        st.markdown("**Lexicon Matches**")
+                        st.dataframe(pd.DataFrame([
+                            {"Lexicon": k, "Hits": v["count"], "Unique": v["unique"],
+                             "Examples": ", ".join(dict.fromkeys(e for e, _, _ in v["positions"]))[:80]}
+                            for k, v in extra.items()
+                        ]), hide_index=True, use_container_width=True)
+
                 # TAB 3: JOB MATCH
                 with tabs[2]:
                     if st.session_state.get("ats_jd_text"):
@@ -794,6 +704,15 @@ def app():
                         else:
                             st.success("Perfect Match! You have all the critical keywords.")
                             
+                        doc_sim = report.get("doc_similarity")
+                        if doc_sim:
+                            st.markdown("#### Document-Level Fit")
+                            ds1, ds2, ds3 = st.columns(3)
+                            ds1.metric("Semantic Fit", f"{doc_sim['score']:.0f}%")
+                            ds2.metric("Best-Passage Match", f"{doc_sim['max_sim']:.2f}")
+                            ds3.metric("Overall Document Match", f"{doc_sim['mean_pooled']:.2f}")
+                            st.caption(f"Compared {doc_sim['resume_chunks']} resume passages against {doc_sim['jd_chunks']} JD passages.")
+
                         # Top Keywords
                         st.markdown("#### Your Top Keywords")
                         found_kws = report.get("top_keywords", [])
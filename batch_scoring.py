@@ -0,0 +1,101 @@
+"""
+Many-to-many resume x JD scoring.
+
+milestone3.compute_similarity scores one resume against one JD. For HR views
+that need every candidate against every open role, score_many embeds each
+unique skill once, computes a single (job skill x unique skill) similarity
+matrix and reduces it per (candidate, job) block. The per-pair stats use the
+same definitions as compute_similarity's `stats` dict.
+"""
+import numpy as np
+import pandas as pd
+
+from embedding_store import normalize_skill
+
+STAT_COLUMNS = ["overall", "matched", "partial", "missing", "total"]
+
+# Upper bound on the (job skills x candidate skill occurrences) block held in
+# memory at once; candidates are processed in chunks below it.
+MAX_BLOCK_CELLS = 20_000_000
+
+
+def _flatten(groups, vocab_index):
+    """Concatenated unique-skill ids plus segment offsets for a list of skill lists."""
+    ids, offsets = [], []
+    for skills in groups:
+        offsets.append(len(ids))
+        ids.extend(vocab_index[k] for k in dict.fromkeys(normalize_skill(s) for s in skills))
+    return np.asarray(ids, dtype=np.int64), np.asarray(offsets, dtype=np.int64)
+
+
+def score_many(candidates, jobs, match_thr=0.8, partial_thr=0.5, encode=None):
+    """
+    candidates: {candidate_id: [resume skills]}
+    jobs:       {job_id: [jd skills]}
+    Returns a columnar DataFrame with one row per (candidate_id, job_id) and the
+    compute_similarity stats columns: overall, matched, partial, missing, total.
+    """
+    if encode is None:
+        from milestone3 import encode_skills as encode
+
+    cand_ids = [c for c, skills in candidates.items() if skills]
+    job_ids = [j for j, skills in jobs.items() if skills]
+    if not cand_ids or not job_ids:
+        return pd.DataFrame(columns=["candidate_id", "job_id"] + STAT_COLUMNS)
+
+    # 1. Embed every unique skill exactly once
+    vocab = list(dict.fromkeys(
+        normalize_skill(s)
+        for group in [candidates[c] for c in cand_ids] + [jobs[j] for j in job_ids]
+        for s in group
+    ))
+    vocab_index = {s: i for i, s in enumerate(vocab)}
+    emb = encode(vocab)
+
+    cand_flat, cand_off = _flatten([candidates[c] for c in cand_ids], vocab_index)
+    job_flat, job_off = _flatten([jobs[j] for j in job_ids], vocab_index)
+    job_sizes = np.diff(np.append(job_off, len(job_flat)))
+
+    # 2. One matmul: every job skill against every unique skill
+    sim = emb[job_flat] @ emb.T  # (total job skills, |vocab|)
+
+    n_cand, n_job = len(cand_ids), len(job_ids)
+    matched = np.empty((n_cand, n_job), dtype=np.int64)
+    partial = np.empty((n_cand, n_job), dtype=np.int64)
+
+    # 3. Per candidate block: best resume skill for every job skill, then
+    #    per job block: count High/Partial matches.
+    cand_ends = np.append(cand_off[1:], len(cand_flat))
+    avg_cand_skills = len(cand_flat) / n_cand
+    chunk = max(1, int(MAX_BLOCK_CELLS / (len(job_flat) * avg_cand_skills)))
+    for start in range(0, n_cand, chunk):
+        stop = min(n_cand, start + chunk)
+        lo, hi = cand_off[start], cand_ends[stop - 1]
+        block = sim[:, cand_flat[lo:hi]]                              # (job skills, candidate skills)
+        best = np.maximum.reduceat(block, cand_off[start:stop] - lo, axis=1)  # (job skills, candidates)
+        hi_mask = best >= match_thr
+        part_mask = (best >= partial_thr) & ~hi_mask
+        matched[start:stop] = np.add.reduceat(hi_mask, job_off, axis=0).T
+        partial[start:stop] = np.add.reduceat(part_mask, job_off, axis=0).T
+
+    total = np.broadcast_to(job_sizes, (n_cand, n_job))
+    overall = ((matched * 1.0 + partial * 0.5) / total * 100).astype(np.int64)
+
+    return pd.DataFrame({
+        "candidate_id": np.repeat(np.asarray(cand_ids, dtype=object), n_job),
+        "job_id": np.tile(np.asarray(job_ids, dtype=object), n_cand),
+        "overall": overall.ravel(),
+        "matched": matched.ravel(),
+        "partial": partial.ravel(),
+        "missing": (total - matched - partial).ravel(),
+        "total": total.ravel(),
+    })
+
+
+def job_skills(job):
+    """Skill list for a job record: explicit `skills`, else extracted from its description/role."""
+    if job.get("skills"):
+        return list(job["skills"])
+    from milestone2 import extract_skills
+    tech, soft = extract_skills(f"{job.get('role', '')}\n{job.get('description', '')}")
+    return tech + soft
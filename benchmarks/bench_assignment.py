@@ -0,0 +1,86 @@
+"""
+Benchmark: argmax vs one-to-one skill assignment.
+
+Synthetic mode times each assignment mode at several matrix sizes. Corpus mode
+(--corpus, needs the spaCy and sentence-transformer models) scores every
+milestone1.SAMPLE_ROLES JD against every other one used as a "resume" and
+reports how much argmax inflates the overall score relative to one-to-one
+matching.
+
+    python -m benchmarks.bench_assignment [--corpus]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from milestone3 import ASSIGNMENT_MODES, assign_skills, score_similarity_matrix
+
+SIZES = [20, 50, 100, 200, 400]
+REPEATS = 5
+
+
+def synthetic(n, seed=3, dim=384):
+    rng = np.random.default_rng(seed)
+    base = rng.normal(size=(max(4, n // 4), dim))
+    res = base[rng.integers(0, len(base), n)] + 0.6 * rng.normal(size=(n, dim))
+    jd = base[rng.integers(0, len(base), n)] + 0.6 * rng.normal(size=(n, dim))
+    res /= np.linalg.norm(res, axis=1, keepdims=True)
+    jd /= np.linalg.norm(jd, axis=1, keepdims=True)
+    return (jd @ res.T).astype(np.float32)
+
+
+def bench_speed():
+    print(f"{'n x n':>9} " + " ".join(f"{m:>12}" for m in ASSIGNMENT_MODES) + "   (ms, best of %d)" % REPEATS)
+    for n in SIZES:
+        sim = synthetic(n)
+        row = []
+        for mode in ASSIGNMENT_MODES:
+            best = float("inf")
+            for _ in range(REPEATS):
+                t0 = time.perf_counter()
+                assign_skills(sim, mode)
+                best = min(best, time.perf_counter() - t0)
+            row.append(best * 1000)
+        print(f"{n:>4} x {n:<3} " + " ".join(f"{t:12.2f}" for t in row))
+
+
+def bench_corpus(match_thr=0.75, partial_thr=0.45):
+    from milestone1 import SAMPLE_ROLES
+    from milestone2 import extract_skills
+    from milestone3 import compute_similarity_matrix
+
+    skills = {}
+    for role, text in SAMPLE_ROLES.items():
+        tech, soft = extract_skills(text)
+        if tech + soft:
+            skills[role] = tech + soft
+
+    overall = {mode: [] for mode in ASSIGNMENT_MODES}
+    for jd_role, jd_skills in skills.items():
+        for res_role, res_skills in skills.items():
+            if res_role == jd_role:
+                continue
+            sim = compute_similarity_matrix(res_skills, jd_skills)
+            for mode in ASSIGNMENT_MODES:
+                _, _, stats = score_similarity_matrix(sim, res_skills, jd_skills, match_thr, partial_thr, mode)
+                overall[mode].append(stats["overall"])
+
+    print(f"\nCorpus: {len(skills)} sample roles, {len(overall['argmax'])} resume/JD pairs")
+    base = np.asarray(overall["argmax"], dtype=float)
+    for mode, scores in overall.items():
+        scores = np.asarray(scores, dtype=float)
+        print(f"  {mode:<10} mean overall {scores.mean():6.2f}  |  argmax inflation {np.mean(base - scores):+6.2f} pts")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", action="store_true", help="Also compare scores on the sample-role corpus")
+    args = parser.parse_args()
+    bench_speed()
+    if args.corpus:
+        bench_corpus()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark: top-50 candidate retrieval over 100k candidate profiles.
+
+Times incremental inserts and queries for the exact NumPy scan and, when
+hnswlib is installed, the HNSW index, and reports HNSW recall@50 against the
+exact result.
+
+    python -m benchmarks.bench_candidate_index
+"""
+import time
+
+import numpy as np
+
+import candidate_index
+from candidate_index import CandidateIndex
+
+N_CANDIDATES = 100_000
+DIM = 384
+K = 50
+N_QUERIES = 100
+INSERT_BATCH = 1_000
+
+
+def make_vectors(n, seed, n_topics=200):
+    # Profiles are means of skill embeddings, so they cluster around a limited
+    # number of role "topics"; isotropic noise alone would be a worst case no
+    # real skill corpus looks like.
+    rng = np.random.default_rng(seed)
+    topics = np.random.default_rng(0).normal(size=(n_topics, DIM))
+    v = topics[rng.integers(0, n_topics, n)] + 0.5 * rng.normal(size=(n, DIM))
+    v = v.astype(np.float32)
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+
+def run(index, data, queries):
+    t0 = time.perf_counter()
+    for start in range(0, len(data), INSERT_BATCH):
+        ids = [f"cand-{i}" for i in range(start, min(start + INSERT_BATCH, len(data)))]
+        index.add(ids, data[start:start + INSERT_BATCH])
+    build = time.perf_counter() - t0
+
+    results, lat = [], []
+    for q in queries:
+        t0 = time.perf_counter()
+        results.append({cid for cid, _ in index.search(q, k=K)})
+        lat.append(time.perf_counter() - t0)
+    return build, np.percentile(lat, 50), np.percentile(lat, 95), results
+
+
+def main():
+    data = make_vectors(N_CANDIDATES, seed=1)
+    queries = make_vectors(N_QUERIES, seed=2)
+    print(f"{N_CANDIDATES} candidates x {DIM} dims, top-{K}, {N_QUERIES} queries")
+
+    build, p50, p95, exact = run(CandidateIndex(DIM, use_ann=False), data, queries)
+    print(f"  exact  : build {build:6.2f} s | query p50 {p50 * 1000:6.2f} ms, p95 {p95 * 1000:6.2f} ms")
+
+    if candidate_index.hnswlib is None:
+        print("  hnsw   : hnswlib not installed, skipped")
+        return
+    build, p50, p95, approx = run(CandidateIndex(DIM, use_ann=True), data, queries)
+    recall = np.mean([len(a & e) / K for a, e in zip(approx, exact)])
+    print(f"  hnsw   : build {build:6.2f} s | query p50 {p50 * 1000:6.2f} ms, p95 {p95 * 1000:6.2f} ms | recall@{K} {recall:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark: action-verb / cliché matching as the lexicons grow.
+
+Compares the previous approach (one `f" {v} " in padded` test per verb and
+one substring scan per cliché) with lexicon.LexiconMatcher's single pass over
+the resume tokens, for built-in sized and synthetic thousands-entry lexicons.
+
+    python -m benchmarks.bench_lexicon
+"""
+import random
+import time
+
+from ats_rules import CLICHES, STRONG_VERBS
+from lexicon import LexiconMatcher
+from text_patterns import WORD_RE
+
+from benchmarks.bench_text_patterns import BLOCK
+
+REPEATS = 10
+
+
+def synthetic_lexicon(base, size, seed):
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    extra = set()
+    while len(extra) < size - len(base):
+        words = ["".join(rng.choice(letters) for _ in range(rng.randint(4, 10))) for _ in range(rng.randint(1, 3))]
+        extra.add(" ".join(words))
+    return list(base) + sorted(extra)
+
+
+def legacy(lower, verbs, cliches):
+    padded = f" {lower} "
+    found_verbs = set(v for v in verbs if f" {v} " in padded)
+    found_cliches = set(c for c in cliches if c in lower)
+    return found_verbs, found_cliches
+
+
+def indexed(matcher, words):
+    # DocumentProfile tokenizes the resume anyway, so only the matching is timed
+    hits = matcher.match_tokens(words)
+    return set(e for e, _, _ in hits["verbs"]), set(e for e, _, _ in hits["cliches"])
+
+
+def timed(fn, *args):
+    best = float("inf")
+    for _ in range(REPEATS):
+        t0 = time.perf_counter()
+        out = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    print(f"best of {REPEATS}")
+    for size in (len(STRONG_VERBS), 1000, 5000):
+        verbs = synthetic_lexicon(STRONG_VERBS, size, 1)
+        cliches = synthetic_lexicon(CLICHES, size, 2)
+        matcher = LexiconMatcher({"verbs": verbs, "cliches": cliches})
+        for copies in (1, 50):
+            lower = (BLOCK * copies).lower()
+            t_old, (v_old, c_old) = timed(legacy, lower, verbs, cliches)
+            t_new, (v_new, c_new) = timed(indexed, matcher, WORD_RE.findall(lower))
+            # Token matching also finds verbs next to punctuation ("led,") and
+            # no longer finds clichés inside other words.
+            assert v_old <= v_new, "indexed matcher missed a verb"
+            print(f"  {size:5d} entries, {len(lower.split()):6d} words: legacy {t_old * 1000:8.3f} ms"
+                  f" | indexed {t_new * 1000:8.3f} ms ({t_old / t_new:.1f}x)"
+                  f" | verbs {len(v_old)}->{len(v_new)}, cliches {len(c_old)}->{len(c_new)}")
+
+
+if __name__ == "__main__":
+    main()
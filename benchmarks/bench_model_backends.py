@@ -0,0 +1,78 @@
+"""
+Benchmark: full-precision vs quantized CPU inference backends.
+
+Encodes the skill vocabulary (skill_taxonomy.collect_vocabulary) with every
+backend milestone3.build_model supports and reports, against the "torch"
+reference:
+  - single-skill latency (p50 / p95, what one interactive request sees)
+  - batch throughput (skills per second over the whole vocabulary)
+  - cosine drift (1 - cos between backend and reference vectors)
+  - nearest-neighbour agreement (top-1 match within the vocabulary)
+
+    python -m benchmarks.bench_model_backends [--extra taxonomy.txt]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from milestone3 import build_model
+from skill_taxonomy import collect_vocabulary
+
+BACKENDS = ["torch", "int8", "onnx"]
+LATENCY_SAMPLES = 200
+
+
+def encode(model, texts, batch_size=64):
+    return np.asarray(model.encode(texts, batch_size=batch_size, normalize_embeddings=True), dtype=np.float32)
+
+
+def measure(model, vocab):
+    encode(model, vocab[:32])  # warm-up (graph build, allocator, thread pool)
+
+    lat = []
+    for skill in (vocab * (LATENCY_SAMPLES // len(vocab) + 1))[:LATENCY_SAMPLES]:
+        t0 = time.perf_counter()
+        encode(model, [skill])
+        lat.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    emb = encode(model, vocab)
+    throughput = len(vocab) / (time.perf_counter() - t0)
+    return np.percentile(lat, 50), np.percentile(lat, 95), throughput, emb
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--extra", action="append", default=[], help="External taxonomy file(s) to add to the vocabulary")
+    args = parser.parse_args()
+
+    vocab = collect_vocabulary(args.extra)
+    print(f"Vocabulary: {len(vocab)} skills\n")
+    print(f"{'backend':<8} {'p50 ms':>8} {'p95 ms':>8} {'skills/s':>10} {'mean drift':>11} {'max drift':>10} {'top-1 agree':>12}")
+
+    reference = None
+    for backend in BACKENDS:
+        try:
+            model = build_model(backend)
+        except Exception as e:
+            print(f"{backend:<8} unavailable: {e}")
+            continue
+
+        p50, p95, throughput, emb = measure(model, vocab)
+        if reference is None:
+            reference = emb
+
+        drift = 1.0 - np.sum(emb * reference, axis=1)
+        # Top-1 neighbour (excluding self) must stay the same for matching to be unaffected
+        ref_sim = reference @ reference.T
+        new_sim = emb @ emb.T
+        np.fill_diagonal(ref_sim, -1)
+        np.fill_diagonal(new_sim, -1)
+        agree = np.mean(ref_sim.argmax(axis=1) == new_sim.argmax(axis=1))
+
+        print(f"{backend:<8} {p50 * 1000:8.2f} {p95 * 1000:8.2f} {throughput:10.0f} {drift.mean():11.5f} {drift.max():10.5f} {agree:12.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: recall and memory of reduced-precision candidate index storage.
+
+Builds exact (no HNSW) candidate indexes over 100k synthetic profiles with
+float32, float16 and float16 + PCA / random projection storage, and reports
+recall@50 against the float32 result plus the projected size of 1M vectors.
+
+    python -m benchmarks.bench_reduced_storage
+"""
+import time
+
+import numpy as np
+
+from benchmarks.bench_candidate_index import DIM, K
+from candidate_index import CandidateIndex
+from embedding_reduction import Projection
+
+N_CANDIDATES = 100_000
+N_QUERIES = 100
+N_FIT = 20_000  # PCA is fitted on a sample, as it would be on the vocabulary
+
+
+def make_vectors(n, seed, n_topics=200, decay=0.8):
+    # Like bench_candidate_index.make_vectors, but with the anisotropic
+    # spectrum of real sentence embeddings (variance decays across directions).
+    # Isotropic noise has no low-dimensional structure for PCA to keep.
+    basis = np.linalg.qr(np.random.default_rng(0).normal(size=(DIM, DIM)))[0]
+    scales = np.arange(1, DIM + 1) ** -decay
+    topics = np.random.default_rng(0).normal(size=(n_topics, DIM)) * scales
+    rng = np.random.default_rng(seed)
+    v = (topics[rng.integers(0, n_topics, n)] + 0.5 * rng.normal(size=(n, DIM)) * scales) @ basis.T
+    v = v.astype(np.float32)
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+
+def search_all(index, queries):
+    t0 = time.perf_counter()
+    results = [{cid for cid, _ in index.search(q, k=K)} for q in queries]
+    return results, (time.perf_counter() - t0) / len(queries)
+
+
+def main():
+    data = make_vectors(N_CANDIDATES, seed=1)
+    queries = make_vectors(N_QUERIES, seed=2)
+    ids = [f"cand-{i}" for i in range(N_CANDIDATES)]
+
+    configs = [
+        ("float32", "float32", None),
+        ("float16", "float16", None),
+        ("float16 + PCA-192", "float16", Projection.fit_pca(data[:N_FIT], 192)),
+        ("float16 + PCA-128", "float16", Projection.fit_pca(data[:N_FIT], 128)),
+        ("float16 + RP-192", "float16", Projection.random(DIM, 192)),
+    ]
+
+    print(f"{N_CANDIDATES} candidates x {DIM} dims, exact top-{K}, {N_QUERIES} queries")
+    exact = None
+    for name, dtype, proj in configs:
+        index = CandidateIndex(DIM, use_ann=False, dtype=dtype, projection=proj)
+        index.add(ids, data)
+        results, latency = search_all(index, queries)
+        if exact is None:
+            exact = results
+        recall = np.mean([len(r & e) / K for r, e in zip(results, exact)])
+        per_million = index.dim * index.dtype.itemsize * 1_000_000 / 2**20
+        print(f"  {name:18s}: recall@{K} {recall:.3f} | query {latency * 1000:6.2f} ms | 1M vectors {per_million:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
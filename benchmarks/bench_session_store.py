@@ -0,0 +1,125 @@
+"""
+Benchmark: persisting session state after a small change.
+
+Simulates a realistic session (resume/JD text, extracted skills, Milestone 3
+results, a few hundred applications, builder data plus ~40 small UI keys) and
+measures a save after one small key changes and a load, for:
+
+  legacy   - json.dumps of the whole state + md5 + plain rewrite of one file
+  json     - session_store.JSONSessionStore (whole file, atomic + fsync)
+  sqlite   - session_store.SQLiteSessionStore with per-key fingerprints,
+             upserting only the changed key
+
+    python -m benchmarks.bench_session_store
+"""
+import hashlib
+import json
+import os
+import random
+import tempfile
+import time
+
+from session_store import JSONSessionStore, SQLiteSessionStore, fingerprint
+
+REPEATS = 30
+
+
+def make_state(applications=300, seed=0):
+    rng = random.Random(seed)
+    words = ["python", "sql", "led", "built", "pipeline", "team", "data", "cloud", "react", "api", "reduced", "latency"]
+    text = lambda n: " ".join(rng.choice(words) for _ in range(n))
+    state = {
+        "session_uid": "abc12345",
+        "resume_manual": text(1500),
+        "jd_manual": text(500),
+        "m2_extracted_skills": {"resume": [text(2) for _ in range(60)], "jd": [text(2) for _ in range(40)]},
+        "m3_results": {
+            "top_matches": {"k": 5, "idx": [[rng.randrange(60) for _ in range(5)] for _ in range(40)],
+                            "score": [[rng.random() for _ in range(5)] for _ in range(40)], "pairs_total": 2400},
+            "jd_details": [{"jd_skill": text(2), "best_match": text(2), "score": rng.random(), "category": "High Match"} for _ in range(40)],
+            "stats": {"overall": 71.5, "high": 20, "partial": 12, "low": 8},
+        },
+        "jobs": [{"id": f"JOB-{i}", "role": text(3), "company": text(1), "location": "Remote", "min_score": 80} for i in range(20)],
+        "applications": [{"job_id": f"JOB-{i % 20}", "applicant": text(2), "job_role": text(3), "score": rng.randint(40, 95),
+                          "status": "Pending", "applied_at": "2 days ago", "resume_version": "v1.0", "company": text(1)}
+                         for i in range(applications)],
+        "cv_data": {"name": "Jane Doe", "summary": text(80),
+                    "experience": [{"title": text(2), "company": text(1), "desc": text(60)} for _ in range(5)]},
+    }
+    for i in range(40):
+        state[f"ui_flag_{i}"] = rng.choice([True, False, i, text(3)])
+    return state
+
+
+def legacy_save(path, state, last_hash):
+    json_str = json.dumps(state)
+    current_hash = hashlib.md5(json_str.encode("utf-8")).hexdigest()
+    if current_hash == last_hash:
+        return last_hash
+    with open(path, "w") as f:
+        f.write(json_str)
+    return current_hash
+
+
+def sqlite_save(store, uid, state, saved):
+    current = {k: fingerprint(v) for k, v in state.items()}
+    changed = {k: state[k] for k, h in current.items() if saved.get(k) != h}
+    deleted = [k for k in saved if k not in current]
+    if changed or deleted:
+        store.write_keys(uid, changed, deleted)
+    return current
+
+
+def best(fn):
+    times = []
+    for i in range(REPEATS):
+        t0 = time.perf_counter()
+        fn(i)
+        times.append(time.perf_counter() - t0)
+    return min(times) * 1000, sorted(times)[len(times) // 2] * 1000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        for apps in (300, 3000):
+            state = make_state(apps)
+            size = len(json.dumps(state))
+            print(f"state: {len(state)} keys, {size / 1024:.0f} KB as JSON ({apps} applications)")
+
+            legacy_path = os.path.join(tmp, f"legacy_{apps}.json")
+            h = [legacy_save(legacy_path, state, None)]
+            def legacy(i):
+                state["ui_flag_0"] = i
+                h[0] = legacy_save(legacy_path, state, h[0])
+
+            js = JSONSessionStore(os.path.join(tmp, f"json_{apps}"), legacy_file=None)
+            js.write("abc12345", state)
+            def json_store(i):
+                state["ui_flag_0"] = i
+                js.write("abc12345", state)
+
+            sq = SQLiteSessionStore(os.path.join(tmp, f"sq_{apps}.db"), legacy_file=None)
+            saved = [sqlite_save(sq, "abc12345", state, {})]
+            def sqlite(i):
+                state["ui_flag_0"] = i
+                saved[0] = sqlite_save(sq, "abc12345", state, saved[0])
+
+            for name, fn in (("legacy", legacy), ("json", json_store), ("sqlite", sqlite)):
+                lo, med = best(fn)
+                print(f"  save, 1 key changed  {name:7s} best {lo:7.2f} ms | median {med:7.2f} ms")
+            print(f"  bytes written per save: legacy/json {size:,} | sqlite {len(json.dumps(state['ui_flag_0'])):,}")
+
+            few = ["resume_manual", "jd_manual", "session_uid"]
+            def legacy_load(i):
+                with open(legacy_path) as f:
+                    json.load(f)
+            for name, fn in (("legacy", legacy_load),
+                             ("sqlite", lambda i: sq.read("abc12345")),
+                             ("sqlite3k", lambda i: sq.read("abc12345", few))):
+                lo, med = best(fn)
+                label = "sqlite (3 keys)" if name == "sqlite3k" else name
+                print(f"  load                 {label:15s} best {lo:7.2f} ms | median {med:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
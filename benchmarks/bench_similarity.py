@@ -0,0 +1,91 @@
+"""
+Benchmark: plot-data construction after the similarity matmul.
+
+Compares the original per-pair Python loop with the vectorized
+milestone3.score_similarity_matrix on a synthetic 200 x 200 skill matrix.
+For the equality check top-k storage is widened to every resume skill; the
+default TOP_K_MATCHES row count is reported alongside.
+
+    python -m benchmarks.bench_similarity
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from milestone3 import score_similarity_matrix, top_k_matches
+
+N_SKILLS = 200
+REPEATS = 20
+
+
+def legacy_plot_data(sim_matrix, resume_skills, jd_skills, match_thr, partial_thr):
+    """The pre-vectorization double loop, kept here as the reference."""
+    plot_data = []
+    for i, jd_skill in enumerate(jd_skills):
+        for j, res_skill in enumerate(resume_skills):
+            if jd_skill.lower().strip() == res_skill.lower().strip():
+                s_val = 1.0
+            else:
+                s_val = float(sim_matrix[i][j])
+            if s_val > 0.3:
+                cat = "High Match" if s_val >= match_thr else "Partial Match" if s_val >= partial_thr else "Low Match"
+                plot_data.append({"jd_skill": jd_skill, "resume_skill": res_skill, "score": s_val, "category": cat})
+    return pd.DataFrame(plot_data)
+
+
+def vectorized_all_pairs(sim_matrix, resume_skills, jd_skills, match_thr, partial_thr):
+    top = top_k_matches(sim_matrix, resume_skills, jd_skills, k=len(resume_skills))
+    return score_similarity_matrix(sim_matrix, resume_skills, jd_skills, match_thr, partial_thr, top=top)
+
+
+def canonical(df, resume_skills):
+    # Top-k rows are ordered by score within a JD skill; the loop by resume position
+    pos = {s: i for i, s in enumerate(resume_skills)}
+    return df.assign(_pos=df["resume_skill"].map(pos)).sort_values(["jd_skill", "_pos"], kind="stable").drop(columns="_pos").reset_index(drop=True)
+
+
+def make_inputs(n=N_SKILLS, dim=384, seed=7):
+    rng = np.random.default_rng(seed)
+    # Shared latent factors give a realistic spread of similarities (not all ~0)
+    base = rng.normal(size=(n // 4, dim))
+    res = base[rng.integers(0, len(base), n)] + 0.6 * rng.normal(size=(n, dim))
+    jd = base[rng.integers(0, len(base), n)] + 0.6 * rng.normal(size=(n, dim))
+    res /= np.linalg.norm(res, axis=1, keepdims=True)
+    jd /= np.linalg.norm(jd, axis=1, keepdims=True)
+    sim = (jd @ res.T).astype(np.float32)
+    resume_skills = [f"Skill {i}" for i in range(n)]
+    jd_skills = [f"skill {i * 2}" for i in range(n)]  # half overlap, different case
+    return sim, resume_skills, jd_skills
+
+
+def timed(fn, *args):
+    best = float("inf")
+    for _ in range(REPEATS):
+        t0 = time.perf_counter()
+        out = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    sim, resume_skills, jd_skills = make_inputs()
+    args = (sim, resume_skills, jd_skills, 0.75, 0.45)
+
+    t_legacy, df_legacy = timed(legacy_plot_data, *args)
+    t_vec, (df_vec, _, _) = timed(vectorized_all_pairs, *args)
+    df_top, _, _ = score_similarity_matrix(*args)
+
+    pd.testing.assert_frame_equal(
+        canonical(df_legacy, resume_skills), canonical(df_vec, resume_skills),
+        check_dtype=False, atol=1e-6
+    )
+
+    print(f"{N_SKILLS}x{N_SKILLS} skills, {len(df_vec)} plotted pairs (best of {REPEATS})")
+    print(f"  default top-k storage keeps {len(df_top)} of them")
+    print(f"  legacy loop : {t_legacy * 1000:8.2f} ms")
+    print(f"  vectorized  : {t_vec * 1000:8.2f} ms  ({t_legacy / t_vec:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
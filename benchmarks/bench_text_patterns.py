@@ -0,0 +1,85 @@
+"""
+Benchmark: contact / metric / section extraction on long resumes.
+
+Compares the previous inline approach (patterns passed as strings on every
+call, the phone pattern run with findall and then again with finditer) with
+text_patterns.extract_entities plus the precompiled section patterns.
+
+    python -m benchmarks.bench_text_patterns
+"""
+import re
+import time
+
+from text_patterns import SECTION_PATTERNS, extract_entities
+
+REPEATS = 20
+
+BLOCK = """Jane Doe
+jane.doe@example.com | +1 (555) 123-4567 | linkedin.com/in/janedoe
+
+Professional Experience
+Senior Data Engineer, Acme Corp (2019 - 2024)
+- Built streaming pipelines processing 2.5M events/day, cutting latency by 40%.
+- Led a team of 6 engineers; delivered $1.2M in annual savings.
+- Migrated 300+ jobs to Airflow with 99.9% uptime.
+
+Education
+B.Sc. Computer Science, State University
+
+Technical Skills
+Python, SQL, Spark, Kafka, AWS, Docker
+"""
+
+
+def legacy(text):
+    lower = text.lower()
+    emails = re.findall(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', text)
+    phone_pattern = r'(\+?\d{1,3}[-.\s]?)?(\(?\d{3}\)?[-.\s]?)?\d{3}[-.\s]?\d{4}'
+    phones = re.findall(phone_pattern, text)
+    valid_phones = []
+    if phones:
+        for m in re.finditer(phone_pattern, text):
+            p_text = m.group(0).strip()
+            if len(re.sub(r'\D', '', p_text)) >= 10:
+                valid_phones.append(p_text)
+    metrics = re.findall(r'(\d+(?:,\d+)*(?:\.\d+)?\s*(%|\$|M|K|\+|k|m))', text)
+    sections = {
+        "Experience": r"(work|professional|relevant|industry)\s+experience|employment\s+history|work\s+history",
+        "Education": r"education|academic|qualification|university",
+        "Skills": r"skills|technical\s+skills|expertise|competencies|technologies",
+        "Projects": r"projects|portfolio|personal\s+projects"
+    }
+    presence = {sec: bool(re.search(p, lower)) for sec, p in sections.items()}
+    return emails, valid_phones, len(metrics), presence
+
+
+def shared(text):
+    lower = text.lower()
+    found = extract_entities(text)
+    presence = {sec: bool(p.search(lower)) for sec, p in SECTION_PATTERNS.items()}
+    return ([s.text for s in found["email"]], [s.text for s in found["phone"]],
+            len(found["metric"]), presence)
+
+
+def timed(fn, text):
+    best = float("inf")
+    for _ in range(REPEATS):
+        t0 = time.perf_counter()
+        out = fn(text)
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    print(f"best of {REPEATS}")
+    for copies in (1, 20, 200):
+        text = BLOCK * copies
+        t_old, out_old = timed(legacy, text)
+        t_new, out_new = timed(shared, text)
+        assert out_old == out_new, "extraction results differ"
+        print(f"  {len(text.split()):7d} words: legacy {t_old * 1000:8.3f} ms | shared {t_new * 1000:8.3f} ms"
+              f" ({t_old / t_new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
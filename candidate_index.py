@@ -0,0 +1,263 @@
+"""
+Vector index over candidate profiles for "top-k candidates for this JD".
+
+A candidate profile is the normalized mean of their skill embeddings; a job
+query is built the same way from the JD skills, so inner product = cosine.
+Uses an HNSW graph (hnswlib) when installed and an exact NumPy scan
+otherwise; both support incremental inserts and persist to disk.
+
+Vectors live in exactly one place: the HNSW graph when hnswlib is used,
+otherwise a dense matrix. SKILLGAP_INDEX_DTYPE (float16 by default) only
+applies to the dense matrix of the exact backend and to vectors.npy on
+disk: hnswlib always stores float32 vectors plus its links. Both backends
+can be shrunk with an embedding_reduction.Projection (fit it with
+embedding_reduction.py); for the dense matrix that brings a 1M-profile
+index from ~1.5 GB down to a few hundred MB. vectors.npy is always written,
+in the index dtype, so an index saved with hnswlib loads without it.
+
+Saving writes the whole index, so callers inserting as they go use
+save_if_due(), which saves at most every CANDIDATE_INDEX_SAVE_INTERVAL
+seconds; the process-wide index is also saved at interpreter exit.
+"""
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from embedding_reduction import PROJECTION_FILE, Projection
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+CANDIDATE_INDEX_DIR = os.environ.get("SKILLGAP_CANDIDATE_INDEX", "candidate_index")
+CANDIDATE_INDEX_DTYPE = os.environ.get("SKILLGAP_INDEX_DTYPE", "float16")
+# Optional projection file (embedding_reduction.Projection) applied to new indexes
+CANDIDATE_INDEX_PROJECTION = os.environ.get("SKILLGAP_INDEX_PROJECTION", "")
+IDS_FILE = "ids.json"
+VECTORS_FILE = "vectors.npy"
+HNSW_FILE = "hnsw.bin"
+
+# Minimum seconds between saves triggered by save_if_due()
+CANDIDATE_INDEX_SAVE_INTERVAL = float(os.environ.get("SKILLGAP_INDEX_SAVE_INTERVAL", "60"))
+
+# Rows upcast to float32 at a time during an exact scan
+SCAN_BLOCK = 8_192
+# Filtered HNSW queries start by fetching this many times k, doubling until enough hits pass
+FILTER_OVERFETCH = 4
+
+
+def profile_vector(skills, encode=None):
+    """Unit-length mean embedding of a skill list (None for an empty list)."""
+    if not skills:
+        return None
+    if encode is None:
+        from milestone3 import encode_skills as encode
+    mean = np.asarray(encode(list(skills)), dtype=np.float32).mean(axis=0)
+    norm = np.linalg.norm(mean)
+    return mean / norm if norm > 0 else None
+
+
+def skills_key(skills):
+    """Order-insensitive digest of a skill list; a changed key means the profile must be re-indexed."""
+    return hashlib.md5(json.dumps(sorted(map(str, skills or ()))).encode("utf-8")).hexdigest()
+
+
+class CandidateIndex:
+    """Incremental top-k inner-product index keyed by candidate id."""
+
+    def __init__(self, dim=384, path=CANDIDATE_INDEX_DIR, use_ann=True, ef_construction=200, m=16,
+                 dtype=CANDIDATE_INDEX_DTYPE, projection=None):
+        if projection is not None and projection.in_dim != dim:
+            raise ValueError(f"Projection expects {projection.in_dim}-dim input, index is {dim}-dim")
+        self.input_dim = dim
+        self.projection = projection
+        self.dim = projection.out_dim if projection is not None else dim  # stored dimension
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float16, np.float32):
+            raise ValueError(f"Unsupported index dtype: {dtype}")
+        self.path = path
+        self.ids = []            # label -> candidate id
+        self.labels = {}         # candidate id -> label
+        self.keys = {}           # candidate id -> skills_key the vector was built from
+        self._vectors = np.zeros((0, self.dim), dtype=self.dtype)  # exact-scan storage (unused with HNSW)
+        self._lock = threading.RLock()
+        self._dirty = False      # changed since the last save
+        self._saved_at = 0.0     # time.monotonic() of the last save
+        self._ann = None
+        if use_ann and hnswlib is not None:
+            self._ann = hnswlib.Index(space="ip", dim=self.dim)
+            self._ann.init_index(max_elements=1024, ef_construction=ef_construction, M=m)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, candidate_id):
+        return candidate_id in self.labels
+
+    @property
+    def vectors(self):
+        """Stored vectors in label order, in the index dtype."""
+        n = len(self.ids)
+        if self._ann is None:
+            return self._vectors[:n]
+        out = np.empty((n, self.dim), dtype=self.dtype)
+        for start in range(0, n, SCAN_BLOCK):
+            stop = min(n, start + SCAN_BLOCK)
+            out[start:stop] = np.asarray(self._ann.get_items(list(range(start, stop))), dtype=np.float32)
+        return out
+
+    def _reserve(self, n):
+        """Amortized growth of the dense matrix (or the HNSW capacity)."""
+        if self._ann is None and n > self._vectors.shape[0]:
+            grown = np.zeros((max(n, 2 * self._vectors.shape[0], 1024), self.dim), dtype=self.dtype)
+            grown[:self._vectors.shape[0]] = self._vectors
+            self._vectors = grown
+        if self._ann is not None and n > self._ann.get_max_elements():
+            self._ann.resize_index(max(n, 2 * self._ann.get_max_elements()))
+
+    def _prepare(self, vectors):
+        """Input-space vectors -> stored space (projected and re-normalized when configured)."""
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        return self.projection.transform(vectors) if self.projection is not None else vectors
+
+    def is_current(self, candidate_id, key):
+        """True if the candidate is indexed from the profile with this skills_key."""
+        return candidate_id in self.labels and self.keys.get(candidate_id) == key
+
+    def add(self, candidate_ids, vectors, keys=None):
+        """
+        Inserts or updates candidates. `vectors` is (n, dim), unit-normalized;
+        `keys` are the skills_key values they were built from (see is_current).
+        """
+        if len(candidate_ids) == 0:
+            return
+        self._insert(candidate_ids, self._prepare(vectors))
+        with self._lock:
+            self._dirty = True
+            if keys is not None:
+                self.keys.update(zip(candidate_ids, keys))
+
+    def _insert(self, candidate_ids, vectors):
+        with self._lock:
+            labels = []
+            for cid in candidate_ids:
+                if cid not in self.labels:
+                    self.labels[cid] = len(self.ids)
+                    self.ids.append(cid)
+                labels.append(self.labels[cid])
+            self._reserve(len(self.ids))
+            labels = np.asarray(labels, dtype=np.int64)
+            if self._ann is not None:
+                # Re-adding an existing label replaces its vector
+                self._ann.add_items(vectors, labels)
+            else:
+                self._vectors[labels] = vectors
+
+    def search(self, query, k=50, ef=None, allowed=None):
+        """
+        Returns [(candidate_id, score)] for the k best candidates, best first.
+        `allowed` (a set of candidate ids) restricts the result to those
+        candidates, e.g. the ones the caller can see; still k results when
+        that many allowed candidates are indexed.
+        """
+        with self._lock:
+            n = len(self.ids)
+            if n == 0:
+                return []
+            if allowed is not None:
+                k = min(k, sum(1 for cid in allowed if cid in self.labels))
+                if k == 0:
+                    return []
+            k = min(k, n)
+            query = self._prepare(query).ravel()
+
+            if self._ann is not None:
+                # Filtered: over-fetch, doubling until k allowed hits (or the whole index)
+                fetch = k if allowed is None else min(n, FILTER_OVERFETCH * k)
+                while True:
+                    self._ann.set_ef(max(ef or 2 * fetch, fetch))
+                    labels, dists = self._ann.knn_query(query, k=fetch)
+                    # hnswlib "ip" distance is 1 - inner product
+                    hits = [(self.ids[l], float(1.0 - d)) for l, d in zip(labels[0], dists[0])]
+                    if allowed is not None:
+                        hits = [(cid, s) for cid, s in hits if cid in allowed]
+                    if len(hits) >= k or fetch >= n:
+                        return hits[:k]
+                    fetch = min(n, 2 * fetch)
+
+            scores = np.empty(n, dtype=np.float32)
+            for start in range(0, n, SCAN_BLOCK):
+                block = self._vectors[start:min(n, start + SCAN_BLOCK)]
+                scores[start:start + len(block)] = block.astype(np.float32, copy=False) @ query
+            if allowed is not None:
+                mask = np.zeros(n, dtype=bool)
+                mask[[self.labels[cid] for cid in allowed if cid in self.labels]] = True
+                scores[~mask] = -np.inf
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(self.ids[i], float(scores[i])) for i in top]
+
+    def save_if_due(self, min_interval=CANDIDATE_INDEX_SAVE_INTERVAL):
+        """Saves unsaved changes unless the last save was under `min_interval` seconds ago."""
+        with self._lock:
+            if self._dirty and time.monotonic() - self._saved_at >= min_interval:
+                self.save()
+
+    def save(self, path=None):
+        path = path or self.path
+        with self._lock:
+            os.makedirs(path, exist_ok=True)
+            np.save(os.path.join(path, VECTORS_FILE), self.vectors)
+            with open(os.path.join(path, IDS_FILE), "w", encoding="utf-8") as f:
+                json.dump({"dim": self.input_dim, "dtype": self.dtype.name, "ids": self.ids, "keys": self.keys}, f)
+            if self.projection is not None:
+                self.projection.save(os.path.join(path, PROJECTION_FILE))
+            if self._ann is not None:
+                self._ann.save_index(os.path.join(path, HNSW_FILE))
+            if path == self.path:
+                self._dirty = False
+                self._saved_at = time.monotonic()
+
+    @classmethod
+    def load(cls, path=CANDIDATE_INDEX_DIR, use_ann=True):
+        with open(os.path.join(path, IDS_FILE), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        proj_path = os.path.join(path, PROJECTION_FILE)
+        projection = Projection.load(proj_path) if os.path.exists(proj_path) else None
+        index = cls(dim=meta["dim"], path=path, use_ann=use_ann,
+                    dtype=meta.get("dtype", "float32"), projection=projection)
+        hnsw_path = os.path.join(path, HNSW_FILE)
+        if index._ann is not None and os.path.exists(hnsw_path):
+            index._ann.load_index(hnsw_path, max_elements=max(1024, len(meta["ids"])))
+            index.ids = list(meta["ids"])
+            index.labels = {cid: i for i, cid in enumerate(index.ids)}
+        else:
+            # No graph on disk (or hnswlib missing): rebuild from the stored vectors
+            vectors = np.load(os.path.join(path, VECTORS_FILE))
+            index._insert(meta["ids"], vectors.astype(np.float32))
+        index.keys = dict(meta.get("keys", {}))
+        return index
+
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_candidate_index():
+    """Process-wide index, loaded from disk when present."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                try:
+                    _index = CandidateIndex.load()
+                except (OSError, ValueError, KeyError):
+                    projection = Projection.load(CANDIDATE_INDEX_PROJECTION) if CANDIDATE_INDEX_PROJECTION else None
+                    _index = CandidateIndex(projection=projection)
+                atexit.register(lambda: _index.save_if_due(0))
+    return _index
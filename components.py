@@ -10,7 +10,10 @@ from streamlit.components.v1 import html
 # -------------------------------------------------------
 # DATA PERSISTENCE
 # -------------------------------------------------------
-SESSION_FILE = "user_session.json"
+# Per-session files live in session_store.SESSION_DIR (SKILLGAP_SESSION_DIR)
+SHARED_EXACT = {
+    "jobs", "applications", "selected_candidate_id", "selected_app_id", "hr_active_tab_index"
+}
 
 EXCLUDED_PREFIXES = (
     "btn_", "dash_btn_", "d_card_", "nav_toggle", "updater_", 
@@ -22,14 +25,10 @@ EXCLUDED_PREFIXES = (
 
 def reset_student_session():
     """Clears ephemeral student data for a fresh start."""
-    persist_exact = {
-        "jobs", "applications", "selected_candidate_id", "selected_app_id", "hr_active_tab_index"
-    }
-    
     # Identify keys to delete (everything NOT persistent)
     keys_to_del = []
     for k in st.session_state.keys():
-        if k in persist_exact or k.startswith("hr_"):
+        if is_shared_key(k):
             continue
         keys_to_del.append(k)
         
@@ -47,33 +46,38 @@ def reset_student_session():
     
     st.rerun()
 
+def is_shared_key(k):
+    """State every session sees (the job board, applications and HR settings)."""
+    return k in SHARED_EXACT or k.startswith("hr_")
+
 def save_progress():
-    """Saves the current session state to a local JSON file ONLY if data changed."""
-    import hashlib
+    """
+    Queues the session's state for the background writer (persistence_writer),
+    which debounces saves and writes only the keys that changed (shared keys
+    also to the shared state). Never waits on disk.
+    """
+    from persistence_writer import get_persistence_writer
+    from session_store import valid_uid
     try:
+        uid = st.session_state.get("session_uid")
+        if not valid_uid(uid):
+            return
+
         # Filter serializable data & exclude UI-only buttons/widgets
         data = {k: v for k, v in st.session_state.items() 
                 if isinstance(v, (str, int, float, bool, list, dict, type(None)))
                 and not k.startswith(EXCLUDED_PREFIXES)
-                and k != "nav_page" and k != "_last_save_hash"}
+                and k != "nav_page"}
         
-        # Optimize: Check hash before writing
-        json_str = json.dumps(data)
-        current_hash = hashlib.md5(json_str.encode('utf-8')).hexdigest()
-        
-        if st.session_state.get("_last_save_hash") == current_hash:
-            return 
-            
-        with open(SESSION_FILE, "w") as f:
-            f.write(json_str)
-            
-        st.session_state["_last_save_hash"] = current_hash
+        get_persistence_writer().save(uid, data, is_shared_key)
             
     except Exception as e:
         pass
 
 def load_progress():
-    """Loads session state from the local JSON file with Session Token logic."""
+    """Loads session state from the session store with Session Token logic."""
+    from persistence_writer import get_persistence_writer
+    from session_store import get_session_store
     if "session_uid" not in st.session_state:
         st.session_state["session_uid"] = str(uuid.uuid4())[:8]
 
@@ -100,30 +104,29 @@ def load_progress():
     # -------------------------------------------------------------
     # SLOW PATH: DISK LOAD
     # -------------------------------------------------------------
-    if not os.path.exists(SESSION_FILE):
-        return
-
     try:
-        with open(SESSION_FILE, "r") as f:
-            data = json.load(f)
-            
-        # 1. Get UID from Saved Data
-        saved_uid = data.get("session_uid", "no_match")
-        
-        # 2. Determine Mode
-        is_navigation = True 
-        if url_uid and saved_uid:
-             u_val = url_uid[0] if isinstance(url_uid, list) else url_uid
-             if str(u_val) != str(saved_uid):
-                 is_navigation = False
-        elif not url_uid:
-             #Fresh Load without uid in URL
-             is_navigation = False
-
-        persist_exact = {
-            "jobs", "applications", "selected_candidate_id", "selected_app_id", "hr_active_tab_index"
-        }
-
+        store = get_session_store()
+        writer = get_persistence_writer()
+        u_val = (url_uid[0] if isinstance(url_uid, list) else url_uid) if url_uid else None
+
+        # Saves still queued (e.g. by the tab being reloaded) must land before
+        # reading: this session's rows and everyone's shared keys, not other
+        # sessions' rows
+        if u_val:
+            writer.flush(str(u_val))
+        writer.flush_shared()
+
+        # 1. Navigation = the URL names a session that has saved state
+        saved_keys = store.keys(u_val) if u_val else None
+        is_navigation = saved_keys is not None
+
+        # 2. Selective load: only keys this script run does not already have.
+        #    Shared keys always come from the shared state (newest across sessions).
+        wanted = [k for k in (saved_keys or ()) if k not in st.session_state and not is_shared_key(k)]
+        data = store.read(u_val, wanted) if wanted else {}
+        data.update({k: v for k, v in store.read_shared().items() if is_shared_key(k)})
+
+        loaded = {}
         for k, v in data.items():
             if k == "nav_page": continue
             
@@ -131,20 +134,16 @@ def load_progress():
             if k.startswith(EXCLUDED_PREFIXES):
                 continue
             
-            should_load = False
-            if is_navigation:
-                should_load = True
-            else:
-                if k in persist_exact or k.startswith("hr_"):
-                    should_load = True
-            
-            if should_load:
-                 if k not in st.session_state:
-                    st.session_state[k] = v
+            if k not in st.session_state:
+                st.session_state[k] = loaded[k] = v
         
-        # 3. Sync Session ID
-        if is_navigation and saved_uid != "no_match":
-            st.session_state["session_uid"] = saved_uid
+        # 3. Sync Session ID; what was just loaded is already saved, and the
+        #    shared values held now are this session's baseline, so its saves
+        #    only merge what it changes afterwards
+        if is_navigation:
+            st.session_state["session_uid"] = str(u_val)
+        held = {k: st.session_state[k] for k in data if is_shared_key(k) and k in st.session_state}
+        writer.mark_saved(st.session_state["session_uid"], {**loaded, **held}, is_shared_key)
 
     except Exception as e:
         pass
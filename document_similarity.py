@@ -0,0 +1,180 @@
+"""
+Document-level semantic similarity between a resume and a JD.
+
+Skill matching only sees extracted keywords. This module splits both texts
+into paragraph/sentence chunks, embeds them in one batch and scores:
+
+* max_sim     - mean over JD chunks of the best-matching resume chunk
+* mean_pooled - cosine between the mean-pooled document vectors
+
+Chunk embeddings go through the shared embedding store keyed by a hash of the
+chunk text, so editing one paragraph only re-embeds that paragraph.
+request_document_similarity runs the same computation on a background
+thread, deduplicated and cached per (resume, JD) pair, for callers on the
+script thread.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from embedding_store import get_embedding_store
+
+MAX_CHUNK_WORDS = 60
+MIN_CHUNK_WORDS = 4
+MAX_SIM_WEIGHT = 0.7  # Blend of max_sim / mean_pooled in the 0-100 score
+
+# Recent (resume hash, JD hash) -> Future entries kept for reuse
+DOC_SIMILARITY_CACHE_SIZE = 256
+# How long a script-thread caller waits for a background result before moving on
+DOC_SIMILARITY_WAIT_SECONDS = float(os.environ.get("SKILLGAP_DOC_SIMILARITY_WAIT", "3"))
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_BULLET = re.compile(r"^\s*[-•*▪●◦]\s*")
+
+
+def split_chunks(text, max_words=MAX_CHUNK_WORDS, min_words=MIN_CHUNK_WORDS):
+    """
+    Paragraph chunks, with long paragraphs split on sentence boundaries and
+    packed up to `max_words`. Fragments shorter than `min_words` (headings,
+    dates) are merged into the following chunk.
+    """
+    chunks, carry = [], ""
+    for para in re.split(r"\n\s*\n|\n(?=\s*[-•*▪●◦])", text or ""):
+        para = " ".join(_BULLET.sub("", line) for line in para.splitlines()).strip()
+        if not para:
+            continue
+        if carry:
+            para, carry = f"{carry} {para}", ""
+
+        current = []
+        for sentence in _SENTENCE_SPLIT.split(para):
+            words = sentence.split()
+            if current and len(current) + len(words) > max_words:
+                chunks.append(" ".join(current))
+                current = []
+            current.extend(words)
+            while len(current) > max_words:
+                chunks.append(" ".join(current[:max_words]))
+                current = current[max_words:]
+
+        if len(current) < min_words:
+            carry = " ".join(current)
+        elif current:
+            chunks.append(" ".join(current))
+
+    if carry:
+        if chunks and len(carry.split()) < min_words:
+            chunks[-1] = f"{chunks[-1]} {carry}"
+        else:
+            chunks.append(carry)
+    return chunks
+
+
+def chunk_key(chunk):
+    """Cache key for a chunk: hash of its whitespace/case-normalized text."""
+    return hashlib.sha1(" ".join(chunk.lower().split()).encode("utf-8")).hexdigest()
+
+
+def embed_chunks(chunks, encode=None, store=None):
+    """L2-normalized (n, dim) chunk embeddings; only unseen chunk hashes are encoded."""
+    from milestone3 import EMBEDDING_MODEL_ID
+    if encode is None:
+        from milestone3 import _LazyModel
+        encode = _LazyModel().encode
+    store = store if store is not None else get_embedding_store()
+    # Separate namespace from skill vectors in the same store
+    model_id = f"{EMBEDDING_MODEL_ID}#chunk"
+
+    keys = [chunk_key(c) for c in chunks]
+    cached = {}
+    if store is not None:
+        try:
+            cached = store.get_many(model_id, keys)
+        except sqlite3.Error:
+            pass
+
+    missing = {k: c for k, c in zip(keys, chunks) if k not in cached}
+    if missing:
+        fresh = np.asarray(encode(list(missing.values()), normalize_embeddings=True), dtype=np.float32)
+        new_entries = dict(zip(missing.keys(), fresh))
+        cached.update(new_entries)
+        if store is not None:
+            try:
+                store.put_many(model_id, new_entries)
+            except sqlite3.Error:
+                pass
+
+    emb = np.vstack([cached[k] for k in keys]).astype(np.float32, copy=False)
+    return emb / np.maximum(np.linalg.norm(emb, axis=1, keepdims=True), 1e-12)
+
+
+def document_similarity(resume_text, jd_text, encode=None):
+    """
+    Returns {"score" (0-100), "max_sim", "mean_pooled", "resume_chunks", "jd_chunks"},
+    or None when either document has no usable text.
+    """
+    res_chunks = split_chunks(resume_text)
+    jd_chunks = split_chunks(jd_text)
+    if not res_chunks or not jd_chunks:
+        return None
+
+    # One batch for both documents
+    emb = embed_chunks(res_chunks + jd_chunks, encode=encode)
+    res_emb, jd_emb = emb[:len(res_chunks)], emb[len(res_chunks):]
+
+    max_sim = float((jd_emb @ res_emb.T).max(axis=1).mean())
+    res_mean, jd_mean = res_emb.mean(axis=0), jd_emb.mean(axis=0)
+    mean_pooled = float(res_mean @ jd_mean / max(np.linalg.norm(res_mean) * np.linalg.norm(jd_mean), 1e-12))
+
+    blended = MAX_SIM_WEIGHT * max_sim + (1 - MAX_SIM_WEIGHT) * mean_pooled
+    return {
+        "score": round(float(np.clip(blended, 0.0, 1.0)) * 100, 1),
+        "max_sim": round(max_sim, 4),
+        "mean_pooled": round(mean_pooled, 4),
+        "resume_chunks": len(res_chunks),
+        "jd_chunks": len(jd_chunks),
+    }
+
+
+_jobs = OrderedDict()
+_jobs_lock = threading.Lock()
+_executor = None
+
+def request_document_similarity(resume_text, jd_text):
+    """
+    Starts (or joins) a background document_similarity for the pair; returns
+    its Future. Successful results stay cached; a failed Future is dropped
+    so the next request retries.
+    """
+    global _executor
+    key = (chunk_key(resume_text or ""), chunk_key(jd_text or ""))
+    with _jobs_lock:
+        future = _jobs.get(key)
+        if future is not None and future.done() and future.exception() is not None:
+            future = None
+        if future is None:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="doc-similarity")
+            future = _jobs[key] = _executor.submit(document_similarity, resume_text, jd_text)
+        _jobs.move_to_end(key)
+        while len(_jobs) > DOC_SIMILARITY_CACHE_SIZE:
+            _jobs.popitem(last=False)
+    return future
+
+
+def document_fit(resume_text, jd_text, timeout=DOC_SIMILARITY_WAIT_SECONDS):
+    """
+    0-100 document similarity, or None if it fails (e.g. no model available),
+    has no usable text or is not ready within `timeout` seconds. Never raises.
+    """
+    try:
+        result = request_document_similarity(resume_text, jd_text).result(timeout=timeout)
+        return result["score"] if result else None
+    except Exception:
+        return None
@@ -0,0 +1,111 @@
+"""
+Dimension reduction for stored embeddings.
+
+A 384-dim float32 vector is 1.5 KB, so a million candidate profiles need
+~1.5 GB before any index overhead. Storing float16 halves that; projecting to
+fewer dimensions (PCA fitted on our skill vocabulary, or a data-independent
+random projection) cuts it further. Projected vectors are re-normalized so an
+inner product is still a cosine.
+
+Fit on the built taxonomy and check recall against full precision:
+
+    python embedding_reduction.py --method pca --dim 128
+"""
+import argparse
+import os
+
+import numpy as np
+
+PROJECTION_FILE = "projection.npz"
+
+
+class Projection:
+    """Linear map x -> normalize((x - mean) @ components.T)."""
+
+    def __init__(self, components, mean=None, method="pca"):
+        self.components = np.asarray(components, dtype=np.float32)
+        self.mean = (np.zeros(self.components.shape[1], dtype=np.float32) if mean is None
+                     else np.asarray(mean, dtype=np.float32))
+        self.method = method
+
+    @property
+    def in_dim(self):
+        return self.components.shape[1]
+
+    @property
+    def out_dim(self):
+        return self.components.shape[0]
+
+    @classmethod
+    def fit_pca(cls, matrix, dim):
+        """Top-`dim` principal components of `matrix` (n, in_dim)."""
+        matrix = np.asarray(matrix, dtype=np.float32)
+        if dim > min(matrix.shape):
+            raise ValueError(f"PCA dim {dim} exceeds min(n, in_dim) = {min(matrix.shape)}")
+        mean = matrix.mean(axis=0)
+        _, _, vt = np.linalg.svd(matrix - mean, full_matrices=False)
+        return cls(vt[:dim], mean, method="pca")
+
+    @classmethod
+    def random(cls, in_dim, dim, seed=0):
+        """Gaussian random projection (Johnson-Lindenstrauss); needs no training data."""
+        rng = np.random.default_rng(seed)
+        return cls(rng.normal(size=(dim, in_dim)) / np.sqrt(dim), method="random")
+
+    def transform(self, vectors):
+        reduced = (np.atleast_2d(np.asarray(vectors, dtype=np.float32)) - self.mean) @ self.components.T
+        return reduced / np.maximum(np.linalg.norm(reduced, axis=1, keepdims=True), 1e-12)
+
+    def save(self, path):
+        np.savez(path, components=self.components, mean=self.mean, method=self.method)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        return cls(data["components"], data["mean"], method=str(data["method"]))
+
+
+def recall_at_k(base, queries, base_approx, queries_approx, k=50):
+    """Mean overlap of approximate top-k with the full-precision top-k."""
+    def top_k(b, q):
+        scores = np.asarray(q, dtype=np.float32) @ np.asarray(b, dtype=np.float32).T
+        return np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+    exact = top_k(base, queries)
+    approx = top_k(base_approx, queries_approx)
+    return float(np.mean([len(np.intersect1d(e, a)) / k for e, a in zip(exact, approx)]))
+
+
+def bytes_per_vector(dim, dtype="float16"):
+    return dim * np.dtype(dtype).itemsize
+
+
+if __name__ == "__main__":
+    from skill_taxonomy import SkillTaxonomy, TAXONOMY_DIR
+
+    parser = argparse.ArgumentParser(description="Fit a projection on the skill taxonomy and report recall.")
+    parser.add_argument("--method", choices=["pca", "random"], default="pca")
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--taxonomy", default=TAXONOMY_DIR)
+    parser.add_argument("--out", default=None, help=f"Output file (default: <taxonomy>/{PROJECTION_FILE})")
+    args = parser.parse_args()
+
+    matrix = np.asarray(SkillTaxonomy(args.taxonomy).matrix, dtype=np.float32)
+    proj = (Projection.fit_pca(matrix, args.dim) if args.method == "pca"
+            else Projection.random(matrix.shape[1], args.dim))
+
+    # Skills double as queries: recall of each skill's nearest neighbours
+    queries = matrix[np.random.default_rng(0).choice(len(matrix), min(500, len(matrix)), replace=False)]
+    k = min(args.k, len(matrix))
+    half = matrix.astype(np.float16)
+    reduced = proj.transform(matrix).astype(np.float16)
+    print(f"{len(matrix)} vocabulary vectors, recall@{k} vs float32:")
+    print(f"  float16 x {matrix.shape[1]:4d} : {recall_at_k(matrix, queries, half, queries, k):.3f}"
+          f" ({bytes_per_vector(matrix.shape[1])} B/vector)")
+    print(f"  float16 x {args.dim:4d} ({args.method}) : {recall_at_k(matrix, queries, reduced, proj.transform(queries), k):.3f}"
+          f" ({bytes_per_vector(args.dim)} B/vector)")
+
+    out = args.out or os.path.join(args.taxonomy, PROJECTION_FILE)
+    proj.save(out)
+    print(f"Saved projection to {out}")
@@ -0,0 +1,176 @@
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+# -------------------------------------------------------
+# PERSISTENT EMBEDDING CACHE
+# -------------------------------------------------------
+# Skill strings are short and repeat across almost every user, so their
+# sentence embeddings are stored on disk (SQLite, shared by all processes on
+# the node) keyed by (model name, normalized skill). Once warm, similarity
+# scoring never has to run the transformer.
+EMBEDDING_CACHE_FILE = os.environ.get("SKILLGAP_EMBEDDING_CACHE", "embedding_cache.db")
+EMBEDDING_CACHE_DTYPE = os.environ.get("SKILLGAP_EMBEDDING_DTYPE", "float16")
+EMBEDDING_CACHE_MAX_ROWS = int(os.environ.get("SKILLGAP_EMBEDDING_MAX_ROWS", "200000"))
+
+# Hits only refresh their LRU timestamp when it is older than this, which keeps
+# warm reads from turning into a write per lookup.
+_TOUCH_INTERVAL = 60.0
+
+def normalize_skill(skill: str) -> str:
+    """Canonical cache key for a skill string ('  Machine  Learning' -> 'machine learning')."""
+    return " ".join(str(skill).lower().split())
+
+
+class EmbeddingStore:
+    """Disk-backed LRU store of skill embeddings, safe to share across processes."""
+
+    def __init__(self, path=EMBEDDING_CACHE_FILE, dtype=EMBEDDING_CACHE_DTYPE, max_rows=EMBEDDING_CACHE_MAX_ROWS):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float16, np.float32):
+            raise ValueError(f"Unsupported embedding dtype: {dtype}")
+        self.max_rows = max_rows
+        self._local = threading.local()
+        self._init_schema()
+
+    def _conn(self):
+        # sqlite3 connections are not shareable across threads; keep one per thread.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        self._conn().execute(
+            """CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                skill TEXT NOT NULL,
+                dtype TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                vec BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, skill)
+            )"""
+        )
+        self._conn().execute("CREATE INDEX IF NOT EXISTS idx_embeddings_lru ON embeddings(last_used)")
+
+    def get_many(self, model_name, skills):
+        """Returns {normalized_skill: float32 vector} for every cached entry."""
+        keys = list(dict.fromkeys(normalize_skill(s) for s in skills))
+        if not keys:
+            return {}
+
+        found = {}
+        stale = []
+        now = time.time()
+        conn = self._conn()
+        # Stay well below SQLite's bound-parameter limit.
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT skill, dtype, dim, vec, last_used FROM embeddings WHERE model = ? AND skill IN ({marks})",
+                [model_name] + chunk,
+            ).fetchall()
+            for skill, dtype, dim, blob, last_used in rows:
+                found[skill] = np.frombuffer(blob, dtype=dtype, count=dim).astype(np.float32)
+                if now - last_used > _TOUCH_INTERVAL:
+                    stale.append(skill)
+
+        if stale:
+            conn.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE model = ? AND skill = ?",
+                [(now, model_name, s) for s in stale],
+            )
+        return found
+
+    def put_many(self, model_name, mapping):
+        """Stores {skill: vector} and evicts least-recently-used rows beyond max_rows."""
+        if not mapping:
+            return
+        now = time.time()
+        rows = []
+        for skill, vec in mapping.items():
+            arr = np.asarray(vec, dtype=self.dtype).ravel()
+            rows.append((model_name, normalize_skill(skill), self.dtype.name, arr.shape[0], arr.tobytes(), now))
+
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._evict(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _evict(self, conn):
+        (count,) = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        excess = count - self.max_rows
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM embeddings WHERE rowid IN (SELECT rowid FROM embeddings ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+
+    def __len__(self):
+        return self._conn().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+def get_embedding_store():
+    """Process-wide store instance; returns None if the cache file cannot be opened."""
+    global _default_store
+    if _default_store is None:
+        with _default_lock:
+            if _default_store is None:
+                try:
+                    _default_store = EmbeddingStore()
+                except (sqlite3.Error, OSError, ValueError):
+                    return None
+    return _default_store
+
+
+def encode_with_cache(model, model_name, texts, store=None, taxonomy=None):
+    """
+    Returns L2-normalized float32 embeddings for `texts`, in order.
+    Known vocabulary is read from `taxonomy` (see skill_taxonomy), the rest from
+    the store; only strings missing from both are sent to `model.encode`.
+    """
+    store = store if store is not None else get_embedding_store()
+    keys = [normalize_skill(t) for t in texts]
+
+    cached = taxonomy.get_many(model_name, keys) if taxonomy is not None else {}
+    pending = [k for k in dict.fromkeys(keys) if k not in cached]
+
+    if pending and store is not None:
+        try:
+            cached.update(store.get_many(model_name, pending))
+        except sqlite3.Error:
+            pass
+
+    missing = [k for k in pending if k not in cached]
+    if missing:
+        fresh = np.asarray(model.encode(missing, normalize_embeddings=True), dtype=np.float32)
+        new_entries = dict(zip(missing, fresh))
+        cached.update(new_entries)
+        if store is not None:
+            try:
+                store.put_many(model_name, new_entries)
+            except sqlite3.Error:
+                pass  # A locked/readonly cache must never break scoring
+
+    emb = np.vstack([cached[k] for k in keys]).astype(np.float32, copy=False)
+    # float16 round-trips drift slightly off the unit sphere; re-normalize so
+    # callers can use a plain dot product as cosine similarity.
+    norms = np.linalg.norm(emb, axis=1, keepdims=True)
+    return emb / np.maximum(norms, 1e-12)
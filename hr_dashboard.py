@@ -385,6 +385,49 @@ def app():
             filtered_apps = [a for a in filtered_apps if a.get("status") == filter_status]
         filtered_apps = [a for a in filtered_apps if a.get("score", 0) >= filter_score]
         
+        # Semantic shortlist: nearest candidate profiles for a role's skill profile
+        with st.expander("🎯 Top Candidates for a Role (Semantic Search)"):
+            if jobs:
+                sl_col1, sl_col2 = st.columns([3, 1])
+                with sl_col1:
+                    sl_job = st.selectbox("Role", jobs, format_func=lambda j: f"{j['role']} • {j['company']}", key="hr_shortlist_job")
+                with sl_col2:
+                    sl_k = st.number_input("Top K", 1, 500, 50, key="hr_shortlist_k")
+
+                from candidate_index import get_candidate_index, profile_vector, skills_key
+                from batch_scoring import job_skills
+                index = get_candidate_index()
+
+                # Incremental insert of any application not yet indexed, or
+                # re-indexed when its skills changed since
+                keyed = [(a, skills_key(a["skills"])) for a in apps if a.get("skills")]
+                new_profiles = [(a["_id"], key, profile_vector(a["skills"])) for a, key in keyed
+                                if not index.is_current(a["_id"], key)]
+                new_profiles = [(cid, key, vec) for cid, key, vec in new_profiles if vec is not None]
+                if new_profiles:
+                    cids, keys, vecs = zip(*new_profiles)
+                    index.add(list(cids), list(vecs), keys=list(keys))
+                    index.save_if_due()
+
+                # The index is process-wide: only rank the applications this page shows
+                query = profile_vector(job_skills(sl_job))
+                by_id = {a["_id"]: a for a in apps}
+                hits = index.search(query, k=int(sl_k), allowed=set(by_id)) if query is not None else []
+                shortlist = [(by_id[cid], score) for cid, score in hits]
+                if shortlist:
+                    st.dataframe(pd.DataFrame([{
+                        "Candidate": a["applicant"],
+                        "Role Applied": a["job_role"],
+                        "Semantic Fit": round(score * 100, 1),
+                        "Document Fit": a.get("doc_similarity"),
+                        "AI Score": a["score"],
+                        "Status": a["status"]
+                    } for a, score in shortlist]), use_container_width=True, hide_index=True)
+                else:
+                    st.info("No indexed candidate profiles yet. Candidates are indexed once they apply with parsed skills.")
+            else:
+                st.info("No active jobs found.")
+
         # C. Master Data View
         if filtered_apps:
             df_display = pd.DataFrame([{
@@ -758,6 +801,27 @@ def app():
         fig_bar.update_layout(paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)", font=dict(color="white"))
         st.plotly_chart(fig_bar, use_container_width=True)
 
+        st.markdown("##### 🧮 Candidate × Role Fit Matrix")
+        st.caption("Scores every candidate with parsed skills against every open role in one batch.")
+        if st.button("Compute Fit Matrix", key="hr_fit_matrix_btn"):
+            from batch_scoring import score_many, job_skills
+            cand_skills = {a["_id"]: a.get("skills", []) for a in apps}
+            role_skills = {j["id"]: job_skills(j) for j in jobs}
+            with st.spinner("Scoring all candidates against all roles..."):
+                fit_df = score_many(cand_skills, role_skills)
+
+            if fit_df.empty:
+                st.info("No candidates with parsed skills yet. Scores appear once students apply after Milestone 2.")
+            else:
+                names = {a["_id"]: a.get("applicant", "Candidate") for a in apps}
+                roles = {j["id"]: j["role"] for j in jobs}
+                fit_df["Candidate"] = fit_df["candidate_id"].map(names)
+                fit_df["Role"] = fit_df["job_id"].map(roles)
+                st.dataframe(
+                    fit_df.pivot_table(index="Candidate", columns="Role", values="overall", aggfunc="max"),
+                    use_container_width=True
+                )
+
     # ========================== TAB 4: JOB MANAGEMENT ==========================
     elif active_idx == 3:
         st.markdown("<br>", unsafe_allow_html=True)
@@ -784,7 +848,8 @@ def app():
                          "role": role,
                          "company": f"{dept} • {loc}",
                          "location": loc,
-                         "min_score": min_s
+                         "min_score": min_s,
+                         "description": desc
                      }
                      st.session_state.setdefault("jobs", []).append(new_job)
                      st.success("Requisition Created!")
@@ -828,4 +893,18 @@ def app():
             st.selectbox("Integration Mode", ["Greenhouse", "Lever", "Workday", "Standalone (Active)"])
             st.slider("Global Latency Threshold (ms)", 100, 2000, 450)
 
+        with st.expander("🧠 Inference Executor"):
+            from milestone3 import get_inference_executor
+            ex_stats = get_inference_executor().stats()
+            st.caption(f"Queue depth: {ex_stats['queue_depth']} · "
+                       f"mean batch: {ex_stats['batch_size']['mean']:.1f} · "
+                       f"mean queue latency: {ex_stats['queue_latency_ms']['mean']:.1f} ms")
+            h1, h2 = st.columns(2)
+            with h1:
+                st.markdown("**Batch size**")
+                st.bar_chart(pd.Series(ex_stats["batch_size"]["buckets"]))
+            with h2:
+                st.markdown("**Queue latency (ms)**")
+                st.bar_chart(pd.Series(ex_stats["queue_latency_ms"]["buckets"]))
+
     components.render_footer()
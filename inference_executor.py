@@ -0,0 +1,174 @@
+"""
+Shared micro-batching executor for sentence-embedding inference.
+
+Every session asks for a handful of skill embeddings at a time. Running each
+request as its own tiny batch wastes the CPU and makes sessions fight over
+the same torch threads, so requests are queued and a single worker coalesces
+everything that arrives within a few milliseconds into one encode call.
+"""
+import bisect
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+BATCH_WINDOW_MS = float(os.environ.get("SKILLGAP_BATCH_WINDOW_MS", "5"))
+MAX_BATCH_SIZE = int(os.environ.get("SKILLGAP_MAX_BATCH_SIZE", "256"))
+MAX_QUEUE_SIZE = int(os.environ.get("SKILLGAP_MAX_QUEUE", "1024"))
+TORCH_THREADS = int(os.environ.get("SKILLGAP_TORCH_THREADS", "0"))  # 0 = torch default
+
+
+class Histogram:
+    """Fixed-bucket, thread-safe histogram (bucket i counts values <= bounds[i])."""
+
+    def __init__(self, bounds):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # last bucket = overflow
+        self.total = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.bounds, value)] += 1
+            self.total += 1
+            self.sum += value
+
+    def snapshot(self):
+        with self._lock:
+            labels = [f"<={b:g}" for b in self.bounds] + [f">{self.bounds[-1]:g}"]
+            return {
+                "buckets": dict(zip(labels, self.counts)),
+                "count": self.total,
+                "mean": self.sum / self.total if self.total else 0.0,
+            }
+
+
+class _Request:
+    __slots__ = ("texts", "future", "enqueued")
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.future = Future()
+        self.enqueued = time.perf_counter()
+
+
+class InferenceExecutor:
+    """
+    Coalesces concurrent encode requests into batches.
+
+    `encode_fn(texts)` must return an (n, dim) array. Callers use `encode()`
+    (blocking) or `submit()` (returns a Future per request).
+    """
+
+    def __init__(self, encode_fn, window_ms=BATCH_WINDOW_MS, max_batch=MAX_BATCH_SIZE,
+                 max_queue=MAX_QUEUE_SIZE, torch_threads=TORCH_THREADS):
+        self.encode_fn = encode_fn
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.torch_threads = torch_threads
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stopped = threading.Event()
+        self.inline_encodes = 0  # requests encoded on the caller's thread because the queue was full
+        self.batch_sizes = Histogram([1, 2, 4, 8, 16, 32, 64, 128, 256])
+        self.queue_latency_ms = Histogram([0.5, 1, 2, 5, 10, 20, 50, 100, 250, 1000])
+        self._worker = threading.Thread(target=self._run, name="inference-executor", daemon=True)
+        self._worker.start()
+
+    def submit(self, texts, timeout=1.0):
+        """Queues a request; raises queue.Full if the executor is saturated."""
+        if self._stopped.is_set():
+            raise RuntimeError("InferenceExecutor is shut down")
+        req = _Request(list(texts))
+        if not req.texts:
+            req.future.set_result(np.zeros((0, 0), dtype=np.float32))
+            return req.future
+        self._queue.put(req, timeout=timeout)
+        if self._stopped.is_set():
+            # Raced with shutdown(): nobody will serve the queue any more
+            self._fail_pending()
+        return req.future
+
+    def encode(self, texts, timeout=None):
+        """Blocking encode; encodes on the calling thread when the queue is full."""
+        try:
+            future = self.submit(texts)
+        except queue.Full:
+            self.inline_encodes += 1
+            return np.asarray(self.encode_fn(list(texts)), dtype=np.float32)
+        return future.result(timeout=timeout)
+
+    def stats(self):
+        return {
+            "queue_depth": self._queue.qsize(),
+            "inline_encodes": self.inline_encodes,
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_latency_ms": self.queue_latency_ms.snapshot(),
+        }
+
+    def shutdown(self):
+        """Stops the worker; requests still queued fail instead of waiting forever."""
+        self._stopped.set()
+        self._worker.join(timeout=5)
+        self._fail_pending()
+
+    def _fail_pending(self):
+        while True:
+            try:
+                req = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if not req.future.done():
+                req.future.set_exception(RuntimeError("InferenceExecutor is shut down"))
+
+    def _collect(self, first):
+        """Gathers requests arriving within the window, up to max_batch texts."""
+        batch, n_texts = [first], len(first.texts)
+        deadline = time.perf_counter() + self.window
+        while n_texts < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                req = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(req)
+            n_texts += len(req.texts)
+        return batch
+
+    def _run(self):
+        if self.torch_threads > 0:
+            try:
+                import torch
+                torch.set_num_threads(self.torch_threads)
+            except ImportError:
+                pass
+
+        while not self._stopped.is_set():
+            try:
+                first = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            batch = self._collect(first)
+
+            started = time.perf_counter()
+            for req in batch:
+                self.queue_latency_ms.observe((started - req.enqueued) * 1000)
+
+            # Identical strings across sessions are encoded once
+            unique = list(dict.fromkeys(t for req in batch for t in req.texts))
+            self.batch_sizes.observe(len(unique))
+            try:
+                vectors = np.asarray(self.encode_fn(unique), dtype=np.float32)
+            except Exception as e:
+                for req in batch:
+                    req.future.set_exception(e)
+                continue
+
+            row = {t: i for i, t in enumerate(unique)}
+            for req in batch:
+                req.future.set_result(vectors[[row[t] for t in req.texts]])
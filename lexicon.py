@@ -0,0 +1,98 @@
+"""
+Single-pass phrase matching for ATS word lists (action verbs, clichés, ...).
+
+Every entry of every lexicon is tokenized with the same WORD_RE used for the
+resume and indexed by its first token. The document is then walked once:
+each token is looked up in the index and only the phrases starting with it
+are compared, so the cost grows with the document length and not with the
+number of entries. Lexicons of thousands of entries cost the same per token
+as the built-in ones.
+
+Extra lexicons (or extra entries for the built-in ones) are loaded from a
+JSON file (SKILLGAP_LEXICONS, default lexicons.json):
+
+    {"verbs": ["underwrote", "hedged"], "banned": ["ninja", "rockstar"]}
+"""
+import json
+import os
+
+from text_patterns import WORD_RE
+
+LEXICONS_FILE = os.environ.get("SKILLGAP_LEXICONS", "lexicons.json")
+
+
+class LexiconMatcher:
+    """Token-phrase index over named lexicons {name: [entries]}."""
+
+    def __init__(self, lexicons):
+        self.lexicons = {name: list(dict.fromkeys(e.lower().strip() for e in entries if e.strip()))
+                         for name, entries in lexicons.items()}
+        # first token -> [(phrase tokens, entry, lexicon names)], longest phrase first
+        index = {}
+        phrases = {}
+        for name, entries in self.lexicons.items():
+            for entry in entries:
+                tokens = tuple(WORD_RE.findall(entry))
+                if not tokens:
+                    continue
+                if tokens not in phrases:
+                    phrases[tokens] = (entry, [])
+                    index.setdefault(tokens[0], []).append(tokens)
+                phrases[tokens][1].append(name)
+        self._index = {first: sorted(((t,) + phrases[t] for t in group), key=lambda p: -len(p[0]))
+                       for first, group in index.items()}
+
+    def match_tokens(self, tokens):
+        """{lexicon: [(entry, first token, last token)]} for every phrase occurrence in `tokens` (lower-cased words)."""
+        hits = {name: [] for name in self.lexicons}
+        index = self._index
+        n = len(tokens)
+        for i, tok in enumerate(tokens):
+            candidates = index.get(tok)
+            if candidates is None:
+                continue
+            for phrase, entry, names in candidates:
+                size = len(phrase)
+                if size == 1 or (i + size <= n and tuple(tokens[i:i + size]) == phrase):
+                    for name in names:
+                        hits[name].append((entry, i, i + size - 1))
+        return hits
+
+    def match(self, text):
+        """
+        {lexicon: {"count", "unique", "positions"}} for `text`, where
+        positions are (entry, start, end) character offsets into `text`.
+        """
+        spans = token_spans(text)
+        return summarize(self.match_tokens([s[0] for s in spans]), spans)
+
+
+def token_spans(text):
+    """[(token, start, end)] of the lower-cased WORD_RE tokens of `text`."""
+    return [(m.group(0), m.start(), m.end()) for m in WORD_RE.finditer(text.lower())]
+
+
+def summarize(hits, spans=None):
+    """
+    match_tokens output -> {lexicon: {"count", "unique", "positions"}}.
+    Positions are (entry, first token, last token), or (entry, start, end)
+    character offsets when the document's token_spans are given.
+    """
+    result = {}
+    for name, found in hits.items():
+        positions = found if spans is None else [(entry, spans[first][1], spans[last][2]) for entry, first, last in found]
+        result[name] = {"count": len(found), "unique": len(set(e for e, _, _ in found)), "positions": positions}
+    return result
+
+
+def load_lexicons(defaults, path=LEXICONS_FILE):
+    """`defaults` extended with the entries from the lexicon file, when there is one."""
+    merged = {name: list(entries) for name, entries in defaults.items()}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            extra = json.load(f)
+    except (OSError, ValueError):
+        return merged
+    for name, entries in extra.items():
+        merged.setdefault(name, []).extend(entries)
+    return merged
@@ -0,0 +1,125 @@
+"""
+Live ATS scoring for the Resume Builder.
+
+The builder's cv dict is rendered to plain text one section at a time, in the
+same order and with the same headers as the exported resume (pdf_gen). Each
+section's DocumentProfile is cached by a hash of its text, so a keystroke in
+one field only re-profiles that section; the per-section profiles are then
+combined and the (cheap, aggregate) ATS checks re-evaluated. Re-running with
+no changes reuses the previous result outright.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+
+from ats_rules import DocumentProfile, get_engine, quality_score
+
+# Per-section profiles kept per scorer (a few versions of every section)
+SECTION_CACHE_SIZE = 64
+
+
+def _bullets(text):
+    # pdf_gen renders every non-empty line of a description as a list item
+    return "\n".join(f"• {line.strip().lstrip('•-* ').strip()}" for line in (text or "").split("\n") if line.strip())
+
+
+def cv_sections(cv):
+    """OrderedDict {section key: plain text} mirroring the exported resume layout."""
+    sections = OrderedDict()
+    contact = [cv.get("email", ""), cv.get("phone", ""), cv.get("linkedin", ""), cv.get("github", "")]
+    sections["basics"] = "\n".join(x for x in [cv.get("name", ""), cv.get("role", ""), " | ".join(c for c in contact if c)] if x)
+
+    if cv.get("summary"):
+        sections["summary"] = f"Professional Summary\n{cv['summary']}"
+
+    if cv.get("education"):
+        sections["education"] = "Education\n" + "\n".join(
+            f"{e.get('school', '')} {e.get('year', '')}\n{e.get('degree', '')}" for e in cv["education"])
+
+    skills = cv.get("skills") or []
+    if skills:
+        if isinstance(skills[0], dict):
+            body = "\n".join(f"{s.get('category', '')}: {s.get('items', '')}" for s in skills)
+        else:
+            body = ", ".join(skills)
+        sections["skills"] = f"Skills\n{body}"
+
+    if cv.get("experience"):
+        sections["experience"] = "Experience\n" + "\n".join(
+            f"{e.get('title', '')}, {e.get('company', '')} {e.get('duration', '')}\n{_bullets(e.get('desc', ''))}"
+            for e in cv["experience"])
+
+    if cv.get("projects"):
+        sections["projects"] = "Projects\n" + "\n".join(
+            f"{p.get('title', '')} ({', '.join(t.strip() for t in p.get('tech', []) if t.strip())})\n{_bullets(p.get('desc', ''))}"
+            for p in cv["projects"])
+
+    if cv.get("achievements"):
+        sections["achievements"] = f"Achievements\n{_bullets(cv['achievements'])}"
+
+    certs = [c for c in cv.get("certifications", []) if c.get("name")]
+    if certs:
+        sections["certifications"] = "Certifications\n" + "\n".join(
+            f"{c['name']} {' - '.join(x for x in [c.get('authority', ''), c.get('year', '')] if x)}" for c in certs)
+    return sections
+
+
+class SectionProfileCache:
+    """LRU of DocumentProfiles keyed by (section, text hash); shared by the live scorer and ats_diff."""
+
+    def __init__(self, max_entries=SECTION_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._profiles = OrderedDict()
+
+    def get(self, name, text):
+        """(profile, fresh): `fresh` is True when the text had to be profiled."""
+        key = (name, hashlib.sha1(text.encode("utf-8")).hexdigest())
+        profile = self._profiles.get(key)
+        if profile is not None:
+            self._profiles.move_to_end(key)
+            return profile, False
+        profile = DocumentProfile(text)
+        self._profiles[key] = profile
+        if len(self._profiles) > self.max_entries:
+            self._profiles.popitem(last=False)
+        return profile, True
+
+
+class LiveATSScorer:
+    """Keeps per-section profiles between reruns; keep one per session."""
+
+    def __init__(self, tenant=None):
+        self.tenant = tenant
+        self._profiles = SectionProfileCache()
+        self._last_key = None
+        self._last_result = None
+
+    def score(self, cv):
+        """
+        {"score", "checks", "section_presence", "word_count", "readability", "recomputed", "elapsed_ms"};
+        `recomputed` lists the sections whose text changed since they were last profiled.
+        """
+        t0 = time.perf_counter()
+        sections = cv_sections(cv)
+        key = tuple(sections.items())
+        if key == self._last_key:
+            return dict(self._last_result, recomputed=[], elapsed_ms=(time.perf_counter() - t0) * 1000)
+
+        parts, recomputed = [], []
+        for name, text in sections.items():
+            profile, fresh = self._profiles.get(name, text)
+            parts.append(profile)
+            if fresh:
+                recomputed.append(name)
+
+        profile = DocumentProfile.combine(parts)
+        checks, raw_score, max_score, _ = get_engine(self.tenant).evaluate(profile)
+        result = {
+            "score": quality_score(raw_score, max_score, profile.section_presence),
+            "checks": checks,
+            "section_presence": profile.section_presence,
+            "word_count": profile.word_count,
+            "readability": profile.readability.metrics(),
+        }
+        self._last_key, self._last_result = key, result
+        return dict(result, recomputed=recomputed, elapsed_ms=(time.perf_counter() - t0) * 1000)
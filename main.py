@@ -53,12 +53,12 @@ with streamlit_analytics.track(unsafe_password=analytics_password):
 
     if "applications" not in st.session_state:
         st.session_state["applications"] = [
-            {"job_id": "JOB-102", "applicant": "Alamanda Balu Karthik", "job_role": "Frontend Developer (React)", "score": 63, "status": "Screening", "applied_at": "2 days ago", "resume_version": "v1.0", "company": "StartupX"},
-            {"job_id": "JOB-101", "applicant": "Alice Chen", "job_role": "Associate Data Scientist", "score": 88, "status": "Interview", "applied_at": "1 day ago", "resume_version": "v1.0", "company": "TechCorp AI"},
-            {"job_id": "JOB-103", "applicant": "Marcus Johnson", "job_role": "DevOps Engineer", "score": 72, "status": "Pending", "applied_at": "3 hours ago", "resume_version": "v1.2", "company": "CloudSystems"},
-            {"job_id": "JOB-104", "applicant": "Sarah Williams", "job_role": "Product Manager", "score": 91, "status": "Accepted", "applied_at": "1 week ago", "resume_version": "v2.0", "company": "Innovate Ltd"},
-            {"job_id": "JOB-102", "applicant": "David Kim", "job_role": "Frontend Developer (React)", "score": 55, "status": "Rejected", "applied_at": "2 weeks ago", "resume_version": "v1.0", "company": "StartupX"},
-            {"job_id": "JOB-101", "applicant": "Priya Patel", "job_role": "Associate Data Scientist", "score": 79, "status": "Screening", "applied_at": "3 days ago", "resume_version": "v1.1", "company": "TechCorp AI"}
+            {"_id": "seed-app-1", "job_id": "JOB-102", "applicant": "Alamanda Balu Karthik", "job_role": "Frontend Developer (React)", "score": 63, "status": "Screening", "applied_at": "2 days ago", "resume_version": "v1.0", "company": "StartupX"},
+            {"_id": "seed-app-2", "job_id": "JOB-101", "applicant": "Alice Chen", "job_role": "Associate Data Scientist", "score": 88, "status": "Interview", "applied_at": "1 day ago", "resume_version": "v1.0", "company": "TechCorp AI"},
+            {"_id": "seed-app-3", "job_id": "JOB-103", "applicant": "Marcus Johnson", "job_role": "DevOps Engineer", "score": 72, "status": "Pending", "applied_at": "3 hours ago", "resume_version": "v1.2", "company": "CloudSystems"},
+            {"_id": "seed-app-4", "job_id": "JOB-104", "applicant": "Sarah Williams", "job_role": "Product Manager", "score": 91, "status": "Accepted", "applied_at": "1 week ago", "resume_version": "v2.0", "company": "Innovate Ltd"},
+            {"_id": "seed-app-5", "job_id": "JOB-102", "applicant": "David Kim", "job_role": "Frontend Developer (React)", "score": 55, "status": "Rejected", "applied_at": "2 weeks ago", "resume_version": "v1.0", "company": "StartupX"},
+            {"_id": "seed-app-6", "job_id": "JOB-101", "applicant": "Priya Patel", "job_role": "Associate Data Scientist", "score": 79, "status": "Screening", "applied_at": "3 days ago", "resume_version": "v1.1", "company": "TechCorp AI"}
         ]
 
     if "applications" in st.session_state:
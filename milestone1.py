@@ -1,6 +1,5 @@
 import streamlit as st
 import io
-import re
 import time
 import json
 from collections import Counter
@@ -9,6 +8,7 @@ from typing import Tuple, List
 import textwrap
 
 import components as ui_components
+from text_patterns import EMAIL_RE, PHONE_BASIC_RE, WORD_RE, WHITESPACE_RE
 
 # -------------------------------------------------------
 # DATA: Sample JDs for Auto-Fill
@@ -107,11 +107,8 @@ def analyze_resume_health(text: str) -> dict:
         checks.append(f"⚠️ Missing Sections: {', '.join(missing)}")
         
     # 3. Contact Info (Basic Regex)
-    email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-    phone_pattern = r'(\+\d{1,2}\s?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}'
-    
-    has_email = re.search(email_pattern, text)
-    has_phone = re.search(phone_pattern, text)
+    has_email = EMAIL_RE.search(text)
+    has_phone = PHONE_BASIC_RE.search(text)
     
     if has_email:
         score += 15
@@ -163,8 +160,8 @@ def analyze_jd_health(text: str) -> dict:
 @st.cache_data
 def calculate_pre_match(resume_text: str, jd_text: str) -> int:
     """Calculates a quick Jaccard similarity score for pre-screening."""
-    r_tokens = set(re.findall(r'\w+', resume_text.lower()))
-    j_tokens = set(re.findall(r'\w+', jd_text.lower()))
+    r_tokens = set(WORD_RE.findall(resume_text.lower()))
+    j_tokens = set(WORD_RE.findall(jd_text.lower()))
     
     # Filter stopwords
     stopwords = {
@@ -191,14 +188,14 @@ def get_top_keywords(text: str, n=10) -> List[Tuple[str, int]]:
         "is", "that", "by", "it", "or", "at", "from", "be", "this", "are",
         "work", "experience", "skills", "education", "will", "have", "your"
     }
-    words = re.findall(r'\w+', text.lower())
+    words = WORD_RE.findall(text.lower())
     filtered = [w for w in words if w not in stopwords and len(w) > 3]
     return Counter(filtered).most_common(n)
 
 def clean_text(text: str) -> str:
     if not text:
         return ""
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = WHITESPACE_RE.sub(' ', text).strip()
     return text
 
 @st.cache_data(show_spinner=False)
@@ -695,12 +692,9 @@ def app():
             # Persist data
             ui_components.save_progress()
             
-            # 1. Extract Skills (M2) - Fast
-            tech_r, soft_r = extract_skills(r_text)
-            tech_j, soft_j = extract_skills(j_text)
-            
-            r_skills = list(set(tech_r + soft_r))
-            j_skills = list(set(tech_j + soft_j))
+            # 1. Extract Skills (M2) - Fast; memoized per document for the later pages
+            from analysis_store import get_analysis_store
+            r_skills, j_skills = get_analysis_store().skill_lists(r_text, j_text)
             
             st.session_state["m2_extracted_skills"] = {
                 "resume": r_skills,
@@ -4,6 +4,7 @@ import textwrap
 
 from datetime import datetime
 from collections import Counter
+from single_flight import single_flight
 
 import base64
 import json
@@ -67,6 +68,7 @@ def clean_text(text: str) -> str:
     return text.lower().strip()
 
 @st.cache_data(ttl=3600)
+@single_flight
 def extract_skills(text):
     """
     Extracts skills using a hybrid approach:
@@ -400,19 +402,17 @@ def app():
 
     has_any_text = bool(resume_text or jd_text)
 
-    # Extract skills
-    tech_resume, soft_resume = ([], [])
-    tech_jd, soft_jd = ([], [])
-
-    if resume_text:
-        tech_resume, soft_resume = extract_skills(resume_text)
-    if jd_text:
-        tech_jd, soft_jd = extract_skills(jd_text)
+    # Extract skills (shared with Milestone 1/3 through the analysis store)
+    from analysis_store import get_analysis_store
+    analysis = get_analysis_store()
+    tech_resume, soft_resume = analysis.skills(resume_text)
+    tech_jd, soft_jd = analysis.skills(jd_text)
+    resume_skill_list, jd_skill_list = analysis.skill_lists(resume_text, jd_text)
 
     # Save extracted skills to session state for Milestone 3 pipeline
     st.session_state["m2_extracted_skills"] = {
-        "resume": list(set(tech_resume + soft_resume)),
-        "jd": list(set(tech_jd + soft_jd)),
+        "resume": resume_skill_list,
+        "jd": jd_skill_list,
     }
     
     # Persist data
@@ -980,17 +980,29 @@ def app():
             
             if r_s and j_s:
                 # Compute heavy matrix
-                from milestone3 import compute_similarity
-                df_plot, details, stats = compute_similarity(r_s, j_s)
+                from milestone3 import (compute_similarity_matrix, top_k_matches, score_similarity_matrix,
+                                        apply_critical_weighting, DEFAULT_MATCH_THR, DEFAULT_PARTIAL_THR)
+                from analysis_store import get_analysis_store
+                analysis = get_analysis_store()
+                resume_text = st.session_state.get("resume_manual", "")
+                jd_text = st.session_state.get("jd_manual", "")
+                if analysis.skill_lists(resume_text, jd_text) == (r_s, j_s):
+                    _, _, sim_matrix = analysis.similarity_matrix(resume_text, jd_text)
+                else:
+                    sim_matrix = compute_similarity_matrix(r_s, j_s)
+                top = top_k_matches(sim_matrix, r_s, j_s)
+                _, details, stats = score_similarity_matrix(sim_matrix, r_s, j_s, DEFAULT_MATCH_THR, DEFAULT_PARTIAL_THR, top=top)
+                stats = apply_critical_weighting(details, stats, [])
                 
                 # Store in M3 expected format
                 st.session_state["m3_results"] = {
-                    "matrix_df": df_plot, 
+                    "top_matches": top, 
                     "jd_details": details, 
                     "stats": stats,
                     "resume_skills": r_s, 
                     "jd_skills": j_s, 
-                    "critical_skills": []
+                    "critical_skills": [],
+                    "thresholds": [DEFAULT_MATCH_THR, DEFAULT_PARTIAL_THR]
                 }
         
         # Navigate
@@ -1,9 +1,13 @@
 import streamlit as st
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 import time
 import textwrap
 import pandas as pd
 import numpy as np
 from collections import Counter
+from single_flight import single_flight
 # Imports moved inside functions to save memory
 
 
@@ -15,82 +19,386 @@ except ImportError:
     SKILL_CATEGORIES = {}
     def get_skill_category(s): return "General"
 
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+# Inference backend: "torch" (full precision, default), "int8" (dynamic int8
+# quantization of the Linear layers, CPU) or "onnx" (exported ONNX graph on
+# onnxruntime, CPU; needs sentence-transformers[onnx]).
+MODEL_BACKEND = os.environ.get("SKILLGAP_MODEL_BACKEND", "torch").lower()
+
+# Cached/precomputed vectors are only valid for the backend that produced them.
+EMBEDDING_MODEL_ID = MODEL_NAME if MODEL_BACKEND == "torch" else f"{MODEL_NAME}+{MODEL_BACKEND}"
+
+def build_model(backend="torch"):
+    """Instantiates the sentence embedding model for the requested backend."""
+    from sentence_transformers import SentenceTransformer
+    if backend == "onnx":
+        try:
+            return SentenceTransformer(MODEL_NAME, device="cpu", backend="onnx")
+        except (ImportError, TypeError, ValueError) as e:
+            # Older sentence-transformers or missing optimum/onnxruntime. No
+            # silent fallback: EMBEDDING_MODEL_ID already names "+onnx", and
+            # vectors from another backend would be cached under it.
+            raise RuntimeError(
+                f"ONNX backend unavailable ({e}); install sentence-transformers[onnx] "
+                f"or set SKILLGAP_MODEL_BACKEND=int8."
+            ) from e
+
+    if backend not in ("torch", "int8"):
+        raise ValueError(f"Unknown model backend: {backend!r}")
+
+    if backend == "int8":
+        import torch
+        model = SentenceTransformer(MODEL_NAME, device="cpu")
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    return SentenceTransformer(MODEL_NAME)
+
 @st.cache_resource(show_spinner="Loading AI Neural Network...")
 def load_model():
     # Model is loaded once per session
-    from sentence_transformers import SentenceTransformer
-    return SentenceTransformer("all-MiniLM-L6-v2")
+    return build_model(MODEL_BACKEND)
+
+@st.cache_resource
+def get_inference_executor():
+    # One worker per process coalesces encode calls from every session into
+    # a single batch (see inference_executor).
+    from inference_executor import InferenceExecutor
+    return InferenceExecutor(lambda texts: load_model().encode(texts, normalize_embeddings=True))
+
+class _LazyModel:
+    """Defers load_model() until an embedding is actually missing from the cache."""
+    def encode(self, texts, **kwargs):
+        # Load on the caller's thread so the spinner shows in the session that waits
+        load_model()
+        return get_inference_executor().encode(texts)
+
+def encode_skills(skills):
+    """
+    Embeds skill strings: known vocabulary comes from the mmapped taxonomy matrix
+    (skill_taxonomy), everything else through the shared on-disk cache.
+    """
+    from embedding_store import encode_with_cache
+    from skill_taxonomy import get_taxonomy
+    # MiniLM is uncased, so embedding the normalized cache key is lossless.
+    return encode_with_cache(_LazyModel(), EMBEDDING_MODEL_ID, skills, taxonomy=get_taxonomy())
+
+# Default thresholds used by Milestone 3 (and by pages that precompute its results)
+DEFAULT_MATCH_THR = 0.75
+DEFAULT_PARTIAL_THR = 0.45
 
 @st.cache_data(show_spinner="Analyzing Semantic Similarity...")
-def compute_similarity(resume_skills, jd_skills, match_thr=0.8, partial_thr=0.5):
+@single_flight
+def compute_similarity_matrix(resume_skills, jd_skills):
     """
-    Computes semantic similarity between resume and JD skills using vector embeddings.
-    Optimized for Streamlit caching.
+    Raw (jd x resume) cosine similarity matrix. This is the only expensive stage,
+    so it is cached on the skill lists alone; thresholds and critical-skill
+    weighting are applied afterwards by score_similarity_matrix.
     """
     if not resume_skills or not jd_skills:
-        return pd.DataFrame(), [], {"overall": 0, "matched": 0, "partial": 0, "missing": 0, "total": 0}
+        return np.zeros((len(jd_skills), len(resume_skills)), dtype=np.float32)
 
-    from sklearn.metrics.pairwise import cosine_similarity
-    model = load_model()
-    
-    all_text = resume_skills + jd_skills
-    embeddings = model.encode(all_text, normalize_embeddings=True)
+    all_text = list(resume_skills) + list(jd_skills)
+    embeddings = encode_skills(all_text)
     
     # Split embeddings back
     n_res = len(resume_skills)
     res_emb = embeddings[:n_res]
     jd_emb = embeddings[n_res:]
     
-    sim_matrix = cosine_similarity(jd_emb, res_emb)
-    
-    jd_details = []
-    plot_data = []
-    
-    matched_count = 0
-    partial_count = 0
-    missing_count = 0
-    
-    for i, jd_skill in enumerate(jd_skills):
-        row = sim_matrix[i]
-        best_idx = np.argmax(row)
-        best_match_skill = resume_skills[best_idx]
-        score = float(row[best_idx])
-        
-        if score >= match_thr:
-            category = "High Match"
-            matched_count += 1
-        elif score >= partial_thr:
-            category = "Partial Match"
-            partial_count += 1
+    # Embeddings are unit-normalized, so cosine similarity is a plain dot product
+    return jd_emb @ res_emb.T
+
+def _empty_similarity_result():
+    return pd.DataFrame(), [], {"overall": 0, "matched": 0, "partial": 0, "missing": 0, "total": 0}
+
+def compute_similarity(resume_skills, jd_skills, match_thr=0.8, partial_thr=0.5, assignment="argmax"):
+    """
+    Computes semantic similarity between resume and JD skills using vector embeddings.
+    Returns (plot DataFrame, per-JD-skill details, stats).
+    """
+    if not resume_skills or not jd_skills:
+        return _empty_similarity_result()
+
+    sim_matrix = compute_similarity_matrix(resume_skills, jd_skills)
+    return score_similarity_matrix(sim_matrix, resume_skills, jd_skills, match_thr, partial_thr, assignment)
+
+def lexical_similarity_matrix(resume_skills, jd_skills):
+    """
+    Instant (jd x resume) similarity from character n-gram TF-IDF vectors.
+    Needs no neural model, so it is shown while the transformer is still cold.
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    if not resume_skills or not jd_skills:
+        return np.zeros((len(jd_skills), len(resume_skills)), dtype=np.float32)
+    vec = TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 4), lowercase=True)
+    tfidf = vec.fit_transform(list(resume_skills) + list(jd_skills))  # rows are L2-normalized
+    n_res = len(resume_skills)
+    return np.asarray((tfidf[n_res:] @ tfidf[:n_res].T).toarray(), dtype=np.float32)
+
+# Semantic matrices computed off the script thread, keyed by skill lists, so a
+# cold model never blocks page rendering.
+_semantic_jobs = {}
+_semantic_lock = threading.Lock()
+_semantic_executor = None
+# A failed job stays cached (so reruns report it instead of resubmitting it)
+# for this long before the same skill lists are tried again.
+SEMANTIC_RETRY_SECONDS = float(os.environ.get("SKILLGAP_SEMANTIC_RETRY_SECONDS", "300"))
+# session_state slot for the session's current (fingerprint, Future, stored) semantic job
+SEMANTIC_JOB_KEY = "m3_semantic_job"
+
+def request_similarity_matrix(resume_skills, jd_skills):
+    """
+    Starts (or joins) a background compute_similarity_matrix; returns its
+    Future. A failed Future is returned as is until SEMANTIC_RETRY_SECONDS
+    have passed since it failed.
+    """
+    global _semantic_executor
+    key = (tuple(resume_skills), tuple(jd_skills))
+    with _semantic_lock:
+        future = _semantic_jobs.get(key)
+        failed_at = getattr(future, "failed_at", None)
+        if failed_at is not None and time.monotonic() - failed_at > SEMANTIC_RETRY_SECONDS:
+            future = None
+        if future is None:
+            if _semantic_executor is None:
+                _semantic_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="m3-semantic")
+            future = _semantic_executor.submit(compute_similarity_matrix, list(resume_skills), list(jd_skills))
+            future.add_done_callback(lambda f, k=key: _semantic_job_done(k, f))
+            _semantic_jobs[key] = future
+    return future
+
+def _semantic_job_done(key, future):
+    if future.exception() is None:
+        with _semantic_lock:
+            if _semantic_jobs.get(key) is future:
+                del _semantic_jobs[key]
+    else:
+        future.failed_at = time.monotonic()
+
+def _session_semantic_job(r_skills, j_skills):
+    """
+    (Future, matrix or None) for this session's skill lists. The job is
+    submitted once per skill-list fingerprint and kept in session_state, so
+    reruns neither rehash the documents nor resubmit; the matrix is returned
+    once the job is done (and is then stored in the analysis store once).
+    """
+    from analysis_store import get_analysis_store
+    from session_store import fingerprint
+    job_key = fingerprint([r_skills, j_skills])
+    # A tuple holding a Future: save_progress skips it (not JSON-serializable)
+    job = st.session_state.get(SEMANTIC_JOB_KEY)
+    # A failed job is re-requested; request_similarity_matrix hands back the
+    # same failed Future until SEMANTIC_RETRY_SECONDS have passed
+    failed = isinstance(job, tuple) and job[1].done() and job[1].exception() is not None
+    if failed or not (isinstance(job, tuple) and job[0] == job_key):
+        analysis = get_analysis_store()
+        resume_text = st.session_state.get("resume_manual", "")
+        jd_text = st.session_state.get("jd_manual", "")
+        # Another page may already have analysed these exact documents
+        cached = analysis.peek("similarity", resume_text, jd_text)
+        if cached is not None and (cached[0], cached[1]) == (r_skills, j_skills):
+            future = Future()
+            future.set_result(cached[2])
+            job = (job_key, future, True)
         else:
-            category = "Low Match"
-            missing_count += 1
-            
-        jd_details.append({
-            "jd_skill": jd_skill,
-            "resume_match": best_match_skill,
-            "score": score,
-            "category": category
-        })
-        
-        for j, res_skill in enumerate(resume_skills):
-            
-            if jd_skill.lower().strip() == res_skill.lower().strip():
-                s_val = 1.0
-            else:
-                s_val = float(sim_matrix[i][j])
-            
-            # Optimization: Only add relevant points to the plot to keep UI snappy
-            if s_val > 0.3: 
-                cat = "High Match" if s_val >= match_thr else "Partial Match" if s_val >= partial_thr else "Low Match"
-                plot_data.append({
-                    "jd_skill": jd_skill,
-                    "resume_skill": res_skill,
-                    "score": s_val,
-                    "category": cat
-                })
-
-    total = len(jd_skills)
+            job = (job_key, request_similarity_matrix(r_skills, j_skills), False)
+        st.session_state[SEMANTIC_JOB_KEY] = job
+
+    _, future, stored = job
+    if not future.done() or future.exception() is not None:
+        return future, None
+    sim_matrix = future.result()
+    if not stored:
+        analysis = get_analysis_store()
+        resume_text = st.session_state.get("resume_manual", "")
+        jd_text = st.session_state.get("jd_manual", "")
+        if analysis.skill_lists(resume_text, jd_text) == (r_skills, j_skills):
+            analysis.put("similarity", resume_text, jd_text, (r_skills, j_skills, sim_matrix))
+        st.session_state[SEMANTIC_JOB_KEY] = (job_key, future, True)
+    return future, sim_matrix
+
+def _refresh_when_ready(future, interval=0.5):
+    """Reruns the page once the background semantic result is available."""
+    fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+    if fragment is None:
+        # Older Streamlit: the page is already rendered with lexical scores,
+        # so waiting here only delays the refresh.
+        future.exception()
+        st.rerun()
+        return
+
+    @fragment(run_every=interval)
+    def _poll():
+        if future.done():
+            st.rerun()
+    _poll()
+
+def apply_critical_weighting(details, stats, critical_skills):
+    """Returns a copy of `stats` whose overall score double-weights critical JD skills."""
+    stats = dict(stats)
+    weighted_score = sum(d['score'] * (2 if d['jd_skill'] in critical_skills else 1) for d in details)
+    total_weight = sum(2 if d['jd_skill'] in critical_skills else 1 for d in details)
+    stats['overall'] = int((weighted_score / total_weight) * 100) if total_weight else stats['overall']
+    return stats
+
+def _categorize(scores, match_thr, partial_thr):
+    """Vectorized High/Partial/Low Match labels for an array of similarity scores."""
+    return np.select(
+        [scores >= match_thr, scores >= partial_thr],
+        ["High Match", "Partial Match"],
+        default="Low Match"
+    )
+
+ASSIGNMENT_MODES = {
+    "argmax": "Best match (many-to-one)",
+    "hungarian": "One-to-one (optimal)",
+    "greedy": "One-to-one (greedy)",
+}
+
+def _greedy_assignment(sim_matrix, floor=0.0):
+    """
+    Greedy one-to-one matching: take pairs in descending similarity while both
+    sides are free. Stops once either side is exhausted or scores drop below
+    `floor` (the bound), so the Python loop only visits useful pairs.
+    """
+    n_jd, n_res = sim_matrix.shape
+    flat = sim_matrix.ravel()
+    order = np.argsort(-flat, kind="stable")
+    order = order[flat[order] >= floor]
+    rows, cols = np.divmod(order, n_res)
+
+    best_idx = np.full(n_jd, -1, dtype=np.int64)
+    res_used = np.zeros(n_res, dtype=bool)
+    remaining = min(n_jd, n_res)
+    for r, c in zip(rows.tolist(), cols.tolist()):
+        if best_idx[r] < 0 and not res_used[c]:
+            best_idx[r] = c
+            res_used[c] = True
+            remaining -= 1
+            if remaining == 0:
+                break
+    return best_idx
+
+def assign_skills(sim_matrix, mode="argmax"):
+    """
+    Picks the resume skill credited to each JD skill.
+    Returns (best_idx, best_scores); best_idx is -1 (score 0) for JD skills left
+    unassigned by a one-to-one mode.
+    """
+    sim_matrix = np.asarray(sim_matrix, dtype=np.float32)
+    n_jd = sim_matrix.shape[0]
+
+    if mode == "argmax":
+        best_idx = sim_matrix.argmax(axis=1)
+    elif mode == "hungarian":
+        try:
+            from scipy.optimize import linear_sum_assignment
+        except ImportError:
+            return assign_skills(sim_matrix, "greedy")
+        rows, cols = linear_sum_assignment(sim_matrix, maximize=True)
+        best_idx = np.full(n_jd, -1, dtype=np.int64)
+        best_idx[rows] = cols
+    elif mode == "greedy":
+        best_idx = _greedy_assignment(sim_matrix)
+    else:
+        raise ValueError(f"Unknown assignment mode: {mode}")
+
+    assigned = best_idx >= 0
+    best_scores = np.zeros(n_jd, dtype=float)
+    best_scores[assigned] = sim_matrix[np.flatnonzero(assigned), best_idx[assigned]]
+    return best_idx, best_scores
+
+# Pairs kept per JD skill for the bubble chart / heatmap. Storing every pair
+# above the plot floor grows with |JD| x |resume| and ends up in the session file.
+TOP_K_MATCHES = int(os.environ.get("SKILLGAP_TOP_K_MATCHES", "5"))
+PLOT_SCORE_FLOOR = 0.3
+
+def top_k_matches(sim_matrix, resume_skills, jd_skills, k=TOP_K_MATCHES):
+    """
+    Compact, JSON-serializable top-k resume matches per JD skill:
+    {"k", "idx": [[resume index, ...] per JD skill], "score": [[...]], "pairs_total"}.
+    Exact (case-insensitive) matches are forced to 1.0 and only pairs above
+    PLOT_SCORE_FLOOR are kept; `pairs_total` counts all such pairs.
+    """
+    sim_matrix = np.asarray(sim_matrix, dtype=np.float32)
+    if sim_matrix.size == 0:
+        return {"k": k, "idx": [[] for _ in jd_skills], "score": [[] for _ in jd_skills], "pairs_total": 0}
+
+    jd_norm = np.array([s.lower().strip() for s in jd_skills])
+    res_norm = np.array([s.lower().strip() for s in resume_skills])
+    plot_scores = np.where(jd_norm[:, None] == res_norm[None, :], np.float32(1.0), sim_matrix)
+
+    kk = min(k, plot_scores.shape[1])
+    top = np.argpartition(-plot_scores, kk - 1, axis=1)[:, :kk]
+    top_scores = np.take_along_axis(plot_scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    top = np.take_along_axis(top, order, axis=1)
+    top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+    keep = top_scores > PLOT_SCORE_FLOOR
+    return {
+        "k": k,
+        "idx": [row[m].tolist() for row, m in zip(top, keep)],
+        "score": [row[m].tolist() for row, m in zip(top_scores, keep)],
+        "pairs_total": int(np.count_nonzero(plot_scores > PLOT_SCORE_FLOOR)),
+    }
+
+def expand_top_matches(top, resume_skills, jd_skills, match_thr=0.8, partial_thr=0.5):
+    """Plot DataFrame (jd_skill, resume_skill, score, category) from top_k_matches output."""
+    counts = [len(row) for row in top["idx"]]
+    cols = np.fromiter((i for row in top["idx"] for i in row), dtype=np.int64, count=sum(counts))
+    scores = np.fromiter((v for row in top["score"] for v in row), dtype=float, count=sum(counts))
+    return pd.DataFrame({
+        "jd_skill": np.repeat(np.asarray(jd_skills, dtype=object), counts),
+        "resume_skill": np.asarray(resume_skills, dtype=object)[cols],
+        "score": scores,
+        "category": _categorize(scores, match_thr, partial_thr)
+    })
+
+def top_k_storage_report(top, df_plot):
+    """(estimated bytes for all-pairs plot records, bytes for the compact top-k form)."""
+    import json
+    compact = len(json.dumps(top))
+    if df_plot.empty:
+        return compact, compact
+    per_record = len(json.dumps(df_plot.to_dict('records'))) / len(df_plot)
+    return int(per_record * top["pairs_total"]), compact
+
+def score_similarity_matrix(sim_matrix, resume_skills, jd_skills, match_thr=0.8, partial_thr=0.5, assignment="argmax", top=None):
+    """
+    Turns a (jd x resume) similarity matrix into plot data, per-JD-skill details and stats.
+    Pure NumPy masks; no per-pair Python work. `assignment` is one of ASSIGNMENT_MODES;
+    `top` reuses an already computed top_k_matches result.
+    """
+    # Nothing to assign (argmax of an empty axis raises): same result as compute_similarity
+    if not len(resume_skills) or not len(jd_skills):
+        return _empty_similarity_result()
+
+    sim_matrix = np.asarray(sim_matrix, dtype=np.float32)
+    n_jd = len(jd_skills)
+    res_arr = np.asarray(resume_skills, dtype=object)
+
+    # Resume skill credited to each JD skill
+    best_idx, best_scores = assign_skills(sim_matrix, assignment)
+    best_cats = _categorize(best_scores, match_thr, partial_thr)
+    best_matches = np.where(best_idx >= 0, res_arr[np.maximum(best_idx, 0)], "")
+
+    jd_details = [
+        {"jd_skill": jd, "resume_match": match, "score": score, "category": cat}
+        for jd, match, score, cat in zip(jd_skills, best_matches.tolist(), best_scores.tolist(), best_cats.tolist())
+    ]
+
+    matched_count = int(np.count_nonzero(best_scores >= match_thr))
+    partial_count = int(np.count_nonzero((best_scores >= partial_thr) & (best_scores < match_thr)))
+    missing_count = n_jd - matched_count - partial_count
+
+    # Plot data: only the top-k pairs per JD skill (see top_k_matches)
+    if top is None:
+        top = top_k_matches(sim_matrix, resume_skills, jd_skills)
+    df_plot = expand_top_matches(top, resume_skills, jd_skills, match_thr, partial_thr)
+
+    total = n_jd
     overall_score = int(((matched_count * 1.0) + (partial_count * 0.5)) / total * 100) if total > 0 else 0
     
     stats = {
@@ -101,7 +409,7 @@ def compute_similarity(resume_skills, jd_skills, match_thr=0.8, partial_thr=0.5)
         "total": total
     }
     
-    return pd.DataFrame(plot_data), jd_details, stats
+    return df_plot, jd_details, stats
 
 def app():
     import components
@@ -386,11 +694,10 @@ def app():
         m2 = st.session_state["m2_extracted_skills"]
         default_resume = m2.get("resume", [])
         default_jd = m2.get("jd", [])
-    elif extract_skills_m1 and (has_resume_data or has_jd_data):
-        if has_resume_data:
-            default_resume = extract_skills_m1(st.session_state["resume_manual"]) or []
-        if has_jd_data:
-            default_jd = extract_skills_m1(st.session_state["jd_manual"]) or []
+    elif has_resume_data or has_jd_data:
+        from analysis_store import get_analysis_store
+        default_resume, default_jd = get_analysis_store().skill_lists(
+            st.session_state.get("resume_manual", ""), st.session_state.get("jd_manual", ""))
 
     no_data = not (default_resume or default_jd)
     r_skills = default_resume
@@ -404,40 +711,76 @@ def app():
         st.stop()
 
     # ====================== CONFIG ======================
-    match_thr = 0.75
-    partial_thr = 0.45
-
     with st.expander("Advanced Configuration (Optional)", expanded=False):
         critical_skills = st.multiselect("Critical Skills (Double Weight)", options=j_skills, default=[])
+        match_thr = st.slider("High Match Threshold", 0.50, 0.95, DEFAULT_MATCH_THR, 0.01, key="m3_match_thr")
+        partial_thr = st.slider("Partial Match Threshold", 0.10, 0.95, DEFAULT_PARTIAL_THR, 0.01, key="m3_partial_thr")
+        partial_thr = min(partial_thr, match_thr)
+        assignment = st.selectbox(
+            "Matching Mode", list(ASSIGNMENT_MODES), format_func=ASSIGNMENT_MODES.get, key="m3_assignment",
+            help="One-to-one modes stop a single resume skill from satisfying several JD skills."
+        )
 
     # ====================== ANALYSIS ENGINE ======================
+    semantic_pending = False
     precomputed = st.session_state.get("m3_results")
-    if precomputed and precomputed.get("resume_skills") == r_skills and precomputed.get("jd_skills") == j_skills:
-        # Reconstruct DataFrame from serializable list
-        df_plot = pd.DataFrame(precomputed.get("plot_data", []))
+    if (precomputed and precomputed.get("resume_skills") == r_skills and precomputed.get("jd_skills") == j_skills
+            and precomputed.get("thresholds") == [match_thr, partial_thr]
+            and precomputed.get("critical_skills") == critical_skills
+            and precomputed.get("assignment", "argmax") == assignment):
+        top = precomputed.get("top_matches")
+        if top is not None:
+            # Expand the compact top-k form only for rendering
+            df_plot = expand_top_matches(top, r_skills, j_skills, match_thr, partial_thr)
+        else:
+            df_plot = pd.DataFrame(precomputed.get("plot_data", []))  # sessions saved before top-k storage
         details = precomputed.get("jd_details", [])
         stats = precomputed.get("stats", {}).copy()
     else:
-        with st.spinner("AI is mapping 10,000+ semantic connections..."):
-            df_plot, details, stats = compute_similarity(r_skills, j_skills, match_thr, partial_thr)
+        # The raw matrix is cached per skill set, so threshold/critical-skill
+        # changes only re-run the cheap categorization below. Until the
+        # semantic job is done (cold model), lexical scores are shown; the
+        # script never waits on it.
+        if not r_skills or not j_skills:
+            # One side has no skills: nothing to embed, every score is zero
+            sim_matrix = np.zeros((len(j_skills), len(r_skills)), dtype=np.float32)
+        else:
+            semantic_job, sim_matrix = _session_semantic_job(r_skills, j_skills)
+            if sim_matrix is None and not semantic_job.done():
+                sim_matrix = lexical_similarity_matrix(r_skills, j_skills)
+                semantic_pending = True
+            elif sim_matrix is None:
+                # The model failed (not just slow): keep the keyword-level scores
+                # and stop polling; the failure is reported once per session.
+                sim_matrix = lexical_similarity_matrix(r_skills, j_skills)
+                e = semantic_job.exception()
+                error = f"{type(e).__name__}: {e}"
+                if st.session_state.get("m3_semantic_error") != error:
+                    st.session_state["m3_semantic_error"] = error
+                    st.warning(f"⚠️ The AI model could not run ({error}). Showing keyword-level matching instead.")
+
+        top = top_k_matches(sim_matrix, r_skills, j_skills)
+        df_plot, details, stats = score_similarity_matrix(sim_matrix, r_skills, j_skills, match_thr, partial_thr, assignment, top=top)
 
         # Weighted scoring with critical skills
-        weighted_score = sum(d['score'] * (2 if d['jd_skill'] in critical_skills else 1) for d in details)
-        total_weight = sum(2 if d['jd_skill'] in critical_skills else 1 for d in details)
-        final_score = int((weighted_score / total_weight) * 100) if total_weight else stats['overall']
-        stats['overall'] = final_score
-
-        st.session_state["m3_results"] = {
-            "plot_data": df_plot.to_dict('records'), # Save as list of dicts for JSON serialization
-            "jd_details": details, 
-            "stats": stats,
-            "resume_skills": r_skills, 
-            "jd_skills": j_skills, 
-            "critical_skills": critical_skills
-        }
-        
-        # Persist results immediately
-        components.save_progress()
+        stats = apply_critical_weighting(details, stats, critical_skills)
+
+        if semantic_pending:
+            st.info("⚡ Showing an instant keyword-level match while the AI model warms up. The semantic analysis will replace it automatically.")
+        else:
+            st.session_state["m3_results"] = {
+                "top_matches": top, # Compact top-k per JD skill, JSON-serializable
+                "jd_details": details, 
+                "stats": stats,
+                "resume_skills": r_skills, 
+                "jd_skills": j_skills, 
+                "critical_skills": critical_skills,
+                "thresholds": [match_thr, partial_thr],
+                "assignment": assignment
+            }
+            
+            # Persist results immediately
+            components.save_progress()
 
     # ====================== 1. EXECUTIVE SUMMARY ======================
     st.markdown('<h2 class="section-header animate-fade-in delay-1">Executive Summary</h2>', unsafe_allow_html=True)
@@ -550,6 +893,10 @@ def app():
             st.markdown('<div class="card-header"><div class="card-icon" style="background:rgba(245,158,11,0.1); border-color:rgba(245,158,11,0.2);">🔥</div><div><div class="card-title">Skill Heatmap</div><div class="card-subtitle">Correlation Analysis</div></div></div>', unsafe_allow_html=True)
             if not df_plot.empty:
                 st.plotly_chart(charts.get_heatmap(df_plot), use_container_width=True)
+            if top is not None and top["pairs_total"] > len(df_plot):
+                full_bytes, compact_bytes = top_k_storage_report(top, df_plot)
+                st.caption(f"Showing the top {top['k']} matches per JD skill: {len(df_plot)} of {top['pairs_total']} pairs "
+                           f"(~{(full_bytes - compact_bytes) / 1024:.1f} KB less session storage).")
 
     # Detailed Table
     st.markdown("<br>", unsafe_allow_html=True)
@@ -762,6 +1109,9 @@ def app():
 
     components.render_footer()
 
+    if semantic_pending:
+        _refresh_when_ready(semantic_job)
+
 if __name__ == "__main__":
     st.set_page_config(page_title="AI Career Gap Analysis • Milestone 3", layout="wide", initial_sidebar_state="collapsed")
     app()
\ No newline at end of file
@@ -0,0 +1,255 @@
+"""
+Background, debounced session persistence.
+
+save_progress() is called from many hot callbacks. Instead of serializing
+and writing on the script thread, it hands a shallow snapshot of the
+session's persistable keys to the PersistenceWriter and returns. A single
+daemon thread keeps only the newest snapshot per session, waits until no new
+save arrived for SAVE_DEBOUNCE_MS (or SAVE_MAX_DELAY_MS passed since the
+first unsaved one), then fingerprints the keys and writes the changed ones
+through the session store. Pending saves are flushed at interpreter exit,
+flush(uid) lets a reader wait for one session's pending save and
+flush_shared() pushes only the shared keys of every pending save.
+
+Shared keys are merged as changes against the shared values the session last
+loaded or wrote (record lists record by record), so a session holding an old
+copy of the shared state never writes that old copy back over newer records.
+
+A snapshot is shallow: a value mutated in place after the save call may be
+written in its newer state, or (if serializing races the mutation) retried
+on the next tick. The callback that mutates it calls save_progress again
+afterwards, so the final state is always written.
+"""
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from session_store import fingerprint, get_session_store, is_record_list, record_key, record_prints
+
+# 0 disables the background thread: every save is written synchronously
+SAVE_DEBOUNCE_MS = float(os.environ.get("SKILLGAP_SAVE_DEBOUNCE_MS", "500"))
+SAVE_MAX_DELAY_MS = float(os.environ.get("SKILLGAP_SAVE_MAX_DELAY_MS", "2000"))
+# Sessions whose last-saved fingerprints are remembered (least recently saved dropped first)
+MAX_TRACKED_SESSIONS = 1000
+
+
+class PersistenceWriter:
+    """Coalesces saves per session and writes them on a background thread."""
+
+    def __init__(self, store=None, debounce_ms=SAVE_DEBOUNCE_MS, max_delay_ms=SAVE_MAX_DELAY_MS):
+        self.store = store
+        self.debounce = debounce_ms / 1000
+        self.max_delay = max(max_delay_ms, debounce_ms) / 1000
+        self._cond = threading.Condition()
+        self._pending = OrderedDict()  # uid -> (data, is_shared, first submit, last submit)
+        # uid -> {"rows": {key: fingerprint} of the session's rows on disk,
+        #         "shared": {key: fingerprint, or {record key: fingerprint} for record lists}
+        #         of the shared values this session last loaded or wrote}
+        self._saved = OrderedDict()
+        self._in_flight = set()        # uids taken off _pending and being written
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._thread = None
+        self.stats = {"submitted": 0, "flushes": 0, "keys_written": 0, "errors": 0}
+
+    def _store(self):
+        return self.store if self.store is not None else get_session_store()
+
+    def save(self, uid, data, is_shared=lambda k: False):
+        """Queues `data` (persistable keys of one session); returns immediately."""
+        now = time.monotonic()
+        with self._cond:
+            self.stats["submitted"] += 1
+            first = self._pending[uid][2] if uid in self._pending else now
+            self._pending[uid] = (dict(data), is_shared, first, now)
+            if self.debounce <= 0 or self._closed:
+                sync = True
+            else:
+                sync = False
+                self._ensure_thread()
+                self._cond.notify()
+        if sync:
+            self.flush(uid)
+
+    def mark_saved(self, uid, data, is_shared=lambda k: False):
+        """
+        Records `data` as already on disk (e.g. just loaded), so it is not
+        written back; shared keys count as the session's view of the shared
+        state, so only what it changes afterwards is merged into it.
+        """
+        # A shared key is also written to the session's own rows on its first save
+        rows = {k: fingerprint(v) for k, v in data.items() if not is_shared(k)}
+        shared = {k: self._shared_print(v) for k, v in data.items() if is_shared(k)}
+        with self._cond:
+            saved = self._saved.setdefault(uid, {"rows": {}, "shared": {}})
+            saved["rows"].update(rows)
+            saved["shared"].update(shared)
+            self._saved.move_to_end(uid)
+
+    @staticmethod
+    def _shared_print(value):
+        return record_prints(value) if is_record_list(value) else fingerprint(value)
+
+    def _shared_changes(self, uid, data, is_shared):
+        """
+        ({key: value to merge into the shared state}, {key: new print}) for the
+        shared keys of `data` that changed since this session loaded/wrote them.
+        Record lists only send the records that changed, so a session never
+        pushes back its stale copy of records other sessions updated.
+        """
+        with self._cond:
+            saved = self._saved.get(uid, {}).get("shared", {})
+        send, prints = {}, {}
+        for k, v in data.items():
+            if not is_shared(k):
+                continue
+            new, old = self._shared_print(v), saved.get(k)
+            if new == old:
+                continue
+            prints[k] = new
+            if isinstance(new, dict) and isinstance(old, dict):
+                v = [x for x in v if old.get(record_key(x)) != new[record_key(x)]]
+                if not v:
+                    continue
+            send[k] = v
+        return send, prints
+
+    def _remember(self, uid, rows=None, shared=None):
+        # Caller holds self._cond
+        saved = self._saved.setdefault(uid, {"rows": {}, "shared": {}})
+        if rows is not None:
+            saved["rows"] = rows
+        if shared:
+            saved["shared"].update(shared)
+        self._saved.move_to_end(uid)
+        while len(self._saved) > MAX_TRACKED_SESSIONS:
+            self._saved.popitem(last=False)
+
+    def flush_shared(self):
+        """
+        Merges the shared keys of every queued save into the shared state now,
+        without writing the sessions' own rows (which stay queued).
+        """
+        with self._cond:
+            pending = [(u, e[0], e[1]) for u, e in self._pending.items() if u not in self._in_flight]
+        if not pending:
+            return
+        with self._write_lock:
+            for uid, data, is_shared in pending:
+                try:
+                    send, prints = self._shared_changes(uid, data, is_shared)
+                    if send:
+                        self._store().update_shared(send)
+                    with self._cond:
+                        self._remember(uid, shared=prints)
+                except Exception:
+                    with self._cond:
+                        self.stats["errors"] += 1  # the queued save retries it
+
+    def flush(self, uid=None):
+        """Writes pending saves now (all sessions, or just `uid`) on the calling thread."""
+        with self._cond:
+            # One write per session at a time, so an older snapshot never lands last
+            while self._in_flight if uid is None else uid in self._in_flight:
+                self._cond.wait()
+            uids = list(self._pending) if uid is None else [uid] if uid in self._pending else []
+            batch = self._take(uids)
+        for u, entry in batch:
+            self._write(u, entry)
+
+    def _take(self, uids):
+        # Caller holds self._cond
+        self._in_flight.update(uids)
+        return [(u, self._pending.pop(u)) for u in uids]
+
+    def _write(self, uid, entry):
+        data, is_shared, first, _ = entry
+        with self._write_lock:
+            try:
+                with self._cond:
+                    saved = dict(self._saved.get(uid, {}).get("rows", {}))
+                current = {k: fingerprint(v) for k, v in data.items()}
+                changed = {k: data[k] for k, h in current.items() if saved.get(k) != h}
+                deleted = [k for k in saved if k not in current]
+                shared, shared_prints = self._shared_changes(uid, data, is_shared)
+                store = self._store()
+                if changed or deleted:
+                    store.write_keys(uid, changed, deleted)
+                if shared:
+                    store.update_shared(shared)
+                with self._cond:
+                    self._remember(uid, rows=current, shared=shared_prints)
+                    self.stats["flushes"] += 1
+                    self.stats["keys_written"] += len(changed) + len(deleted)
+            except (RuntimeError, sqlite3.OperationalError):
+                # A value mutated mid-serialization or a locked database:
+                # keep it pending (unless a newer save replaced it) for the next tick
+                with self._cond:
+                    self.stats["errors"] += 1
+                    if uid not in self._pending and not self._closed:
+                        self._pending[uid] = (data, is_shared, first, time.monotonic())
+            except Exception:
+                with self._cond:
+                    self.stats["errors"] += 1
+            finally:
+                with self._cond:
+                    self._in_flight.discard(uid)
+                    self._cond.notify_all()
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._loop, name="skillgap-persistence", daemon=True)
+            self._thread.start()
+
+    def _due(self, now):
+        """(uids ready to write, seconds until the next one is)."""
+        ready, wait = [], None
+        for uid, (_, _, first, last) in self._pending.items():
+            if uid in self._in_flight:
+                continue
+            at = min(last + self.debounce, first + self.max_delay)
+            if at <= now:
+                ready.append(uid)
+            else:
+                wait = at - now if wait is None else min(wait, at - now)
+        return ready, wait
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while not self._closed:
+                    ready, wait = self._due(time.monotonic())
+                    if ready:
+                        break
+                    self._cond.wait(wait)
+                if self._closed:
+                    return
+                batch = self._take(ready)
+            for uid, entry in batch:
+                self._write(uid, entry)
+
+    def close(self):
+        """Stops the thread and writes everything still pending."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.flush()
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+def get_persistence_writer():
+    """Process-wide writer; flushed at interpreter exit."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = PersistenceWriter()
+                atexit.register(_writer.close)
+    return _writer
@@ -0,0 +1,143 @@
+"""
+Readability metrics (Flesch, Flesch-Kincaid, Gunning Fog, passive voice,
+bullet density) for resumes.
+
+A document is tokenized once with TOKEN_RE into words, numbers, sentence
+terminators, line breaks and bullet markers; everything else is NumPy
+array work over that token table (sentence/line ids by cumulative sum,
+syllables looked up per distinct word). The raw counts are kept in a
+ReadabilityStats, which adds up across sections, so per-section results
+can be cached and combined. `readability(text)` caches stats by document
+hash.
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# One group per token kind, in column order
+TOKEN_RE = re.compile(
+    r"(?m)(^[ \t]*[•▪◦●\-\*](?=\s))"     # bullet marker at line start
+    r"|([A-Za-z]+(?:'[A-Za-z]+)*)"       # word
+    r"|(\d+(?:[.,]\d+)*)"                # number
+    r"|([.!?]+)"                         # sentence terminator
+    r"|(\n)"                             # line break (also ends a sentence: bullets rarely have periods)
+)
+BULLET, WORD, NUMBER, TERMINATOR, NEWLINE = range(5)
+
+VOWEL_GROUPS_RE = re.compile(r"[aeiouy]+")
+BE_FORMS = ["am", "is", "are", "was", "were", "be", "been", "being"]
+IRREGULAR_PARTICIPLES = [
+    "built", "made", "done", "given", "taken", "written", "shown", "known", "seen", "led", "paid",
+    "sent", "held", "kept", "brought", "bought", "taught", "found", "told", "won", "chosen", "driven",
+]
+
+READABILITY_CACHE_SIZE = 256
+_SYLLABLE_CACHE_LIMIT = 50000
+_syllables = {}
+
+
+def count_syllables(word):
+    """Vowel-group heuristic: silent final 'e' dropped, at least one syllable."""
+    n = _syllables.get(word)
+    if n is None:
+        n = len(VOWEL_GROUPS_RE.findall(word))
+        if word.endswith("e") and not word.endswith(("le", "ee", "ye")) and n > 1:
+            n -= 1
+        n = max(1, n)
+        if len(_syllables) >= _SYLLABLE_CACHE_LIMIT:
+            _syllables.clear()
+        _syllables[word] = n
+    return n
+
+
+class ReadabilityStats:
+    """Additive counts behind the readability metrics."""
+    FIELDS = ("words", "sentences", "syllables", "complex_words", "passive_sentences", "lines", "bullet_lines")
+
+    def __init__(self, **counts):
+        for f in self.FIELDS:
+            setattr(self, f, int(counts.get(f, 0)))
+
+    @classmethod
+    def from_text(cls, text):
+        found = TOKEN_RE.findall(text or "")
+        if not found:
+            return cls()
+        table = np.array(found, dtype=str)
+        kind = np.argmax(table != "", axis=1)
+
+        is_word = (kind == WORD) | (kind == NUMBER)
+        sentence_id = np.cumsum((kind == TERMINATOR) | (kind == NEWLINE))
+        line_id = np.cumsum(kind == NEWLINE)
+
+        word_rows = np.flatnonzero(is_word)
+        words = np.char.lower(np.where(kind[word_rows] == WORD, table[word_rows, WORD], table[word_rows, NUMBER]))
+        word_sentence = sentence_id[word_rows]
+
+        # Syllables: once per distinct word, spread back with the inverse index
+        vocab, inverse = np.unique(words, return_inverse=True)
+        syllables = np.array([count_syllables(w) if w[0].isalpha() else 1 for w in vocab], dtype=np.int32)[inverse]
+
+        # Passive: a form of "to be" followed by a participle (optionally an -ly adverb in between)
+        is_be = np.isin(words, BE_FORMS)
+        is_participle = np.char.endswith(words, "ed") | np.char.endswith(words, "en") | np.isin(words, IRREGULAR_PARTICIPLES)
+        is_adverb = np.char.endswith(words, "ly")
+        same_next = word_sentence[:-1] == word_sentence[1:]
+        passive = np.zeros(len(words), dtype=bool)
+        passive[:-1] |= is_be[:-1] & is_participle[1:] & same_next
+        passive[:-2] |= is_be[:-2] & is_adverb[1:-1] & is_participle[2:] & same_next[:-1] & same_next[1:]
+
+        content_lines = np.unique(line_id[word_rows])
+        bullet_lines = np.intersect1d(np.unique(line_id[kind == BULLET]), content_lines)
+        return cls(
+            words=len(words),
+            sentences=len(np.unique(word_sentence)),
+            syllables=syllables.sum(),
+            complex_words=np.count_nonzero(syllables >= 3),
+            passive_sentences=len(np.unique(word_sentence[passive])),
+            lines=len(content_lines),
+            bullet_lines=len(bullet_lines),
+        )
+
+    @classmethod
+    def combine(cls, parts):
+        """Stats of newline-joined texts: every count simply adds up."""
+        return cls(**{f: sum(getattr(p, f) for p in parts) for f in cls.FIELDS})
+
+    def metrics(self):
+        words, sentences = max(self.words, 1), max(self.sentences, 1)
+        wps = self.words / sentences
+        spw = self.syllables / words
+        return {
+            "flesch_reading_ease": round(206.835 - 1.015 * wps - 84.6 * spw, 1) if self.words else 0.0,
+            "flesch_kincaid_grade": round(0.39 * wps + 11.8 * spw - 15.59, 1) if self.words else 0.0,
+            "gunning_fog": round(0.4 * (wps + 100 * self.complex_words / words), 1) if self.words else 0.0,
+            "passive_ratio": round(self.passive_sentences / sentences, 3) if self.sentences else 0.0,
+            "bullet_density": round(self.bullet_lines / self.lines, 3) if self.lines else 0.0,
+            "avg_sentence_len": round(wps, 1),
+            "avg_syllables_per_word": round(spw, 2),
+            "words": self.words,
+            "sentences": self.sentences,
+        }
+
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+def readability(text):
+    """ReadabilityStats for `text`, cached by document hash."""
+    key = hashlib.sha1((text or "").encode("utf-8")).hexdigest()
+    with _cache_lock:
+        stats = _cache.get(key)
+        if stats is not None:
+            _cache.move_to_end(key)
+            return stats
+    stats = ReadabilityStats.from_text(text)
+    with _cache_lock:
+        _cache[key] = stats
+        if len(_cache) > READABILITY_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return stats
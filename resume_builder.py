@@ -3,8 +3,8 @@ import time
 import components
 import base64
 import textwrap
-import re
 import pdf_gen
+from text_patterns import GITHUB_URL_RE, LINKEDIN_URL_RE, NUMBER_RE
 
 # ------------------------------------------------------------------------------
 # 1.HELPER FUNCTIONS & RENDERERS
@@ -30,12 +30,9 @@ def validate_basics_section(cv):
     if not cv.get("phone"): errors.append("Phone is required.")
     
     # URL Validation
-    github_re = r"^(https?://)?(www\.)?github\.com/[A-Za-z0-9_.-]+/?$"
-    linkedin_re = r"^(https?://)?(www\.)?linkedin\.com/in/[A-Za-z0-9_-]+/?$"
-    
-    if cv.get("github") and not re.match(github_re, cv["github"]):
+    if cv.get("github") and not GITHUB_URL_RE.match(cv["github"]):
         errors.append("Invalid GitHub URL (must be github.com/username)")
-    if cv.get("linkedin") and not re.match(linkedin_re, cv["linkedin"]):
+    if cv.get("linkedin") and not LINKEDIN_URL_RE.match(cv["linkedin"]):
         errors.append("Invalid LinkedIn URL (must be linkedin.com/in/username)")
         
     return errors
@@ -53,7 +50,7 @@ def generate_ai_suggestions(text, section):
         suggestions.append("• Use strong action verbs (e.g., Led, Developed, Optimized) to start sentences.")
         
     # 2. Check for Metrics
-    if not re.search(r'\d+%|\d+', text):
+    if not NUMBER_RE.search(text):
         suggestions.append("• Quantify your impact with numbers (e.g., 'Increased revenue by 20%', 'Managed team of 5').")
         
     # 3. Length Check
@@ -522,6 +519,27 @@ def app():
         components.save_progress()
 
         with col_view:
+            # Live ATS score: only sections edited since the last rerun are re-analyzed
+            if "res_live_ats" not in st.session_state:
+                from live_ats import LiveATSScorer
+                st.session_state["res_live_ats"] = LiveATSScorer()
+            live = st.session_state["res_live_ats"].score(cv)
+            failed = [c for c in live["checks"] if not c["status"]]
+            with st.container(border=True):
+                la1, la2 = st.columns([1, 2])
+                la1.metric("Live ATS Score", f"{live['score']:.0f}%")
+                with la2:
+                    st.progress(min(1.0, live["score"] / 100))
+                    updated = ", ".join(live["recomputed"]) or "no changes"
+                    rd = live["readability"]
+                    st.caption(f"Flesch {rd['flesch_reading_ease']} · Fog {rd['gunning_fog']} · "
+                               f"{rd['passive_ratio'] * 100:.0f}% passive · {rd['bullet_density'] * 100:.0f}% bullets")
+                    st.caption(f"Updated in {live['elapsed_ms']:.1f} ms ({updated}). Resume quality only; JD match is on the ATS page.")
+                if failed:
+                    with st.expander(f"⚠️ {len(failed)} ATS checks to fix"):
+                        for c in failed:
+                            st.markdown(f"- **{c['name']}** ({c['impact']}): {c['feedback']}")
+
             st.markdown("#### Only Preview")
             html_out = render_preview(cv, ui)
             st.components.v1.html(html_out, height=800, scrolling=True)
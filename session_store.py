@@ -0,0 +1,335 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: no advisory locks; atomic renames still keep files intact
+    fcntl = None
+
+# -------------------------------------------------------
+# PER-SESSION STATE FILES
+# -------------------------------------------------------
+# Each browser session (session_uid) gets its own JSON file, so concurrent
+# users never overwrite each other. State that is deliberately shared by
+# everyone (jobs, applications, HR settings) lives in one shared file that is
+# merged key by key (lists of records by record id) under an exclusive lock. Every write goes to a temp file
+# in the same directory and is renamed over the target, so a crash mid-write
+# leaves the previous version intact and readers never see a partial file.
+#
+# The default backend is SQLite instead (SQLiteSessionStore): same layout,
+# but one row per (session, key), so a save only writes the keys that changed.
+SESSION_DIR = os.environ.get("SKILLGAP_SESSION_DIR", "sessions")
+# "sqlite" (one row per session/key, see SQLiteSessionStore) or "json" (one file per session)
+SESSION_BACKEND = os.environ.get("SKILLGAP_SESSION_BACKEND", "sqlite")
+SESSION_DB_FILE = os.environ.get("SKILLGAP_SESSION_DB", os.path.join(SESSION_DIR, "sessions.db"))
+SHARED_NAME = "_shared"
+# Single shared file used before per-session files; read once for migration
+LEGACY_SESSION_FILE = "user_session.json"
+
+_UID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+# Shared lists of records (applications, jobs) are merged record by record on
+# the first of these fields a record has, so two sessions that each append to
+# "applications" keep both records instead of the last writer's list winning.
+RECORD_ID_FIELDS = ("_id", "id")
+
+
+def valid_uid(uid):
+    """Session ids come from the URL; only plain tokens may become file names."""
+    return bool(uid) and bool(_UID_RE.match(str(uid))) and str(uid) != SHARED_NAME
+
+
+def atomic_write_json(path, data):
+    """Writes `data` to a temp file next to `path`, fsyncs and renames it into place."""
+    directory = os.path.dirname(path) or "."
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def record_key(item):
+    for f in RECORD_ID_FIELDS:
+        if item.get(f) is not None:
+            return ("id", str(item[f]))
+    return ("content", _content_key(item))
+
+
+def _content_key(item):
+    bare = {k: v for k, v in item.items() if k not in RECORD_ID_FIELDS}
+    return hashlib.md5(json.dumps(bare, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def is_record_list(value):
+    return isinstance(value, list) and all(isinstance(x, dict) for x in value)
+
+
+def record_prints(value):
+    """{record key: fingerprint} for a list of records, so callers can send only the records that changed."""
+    return {record_key(x): fingerprint(x) for x in value}
+
+
+def merge_records(stored, incoming):
+    """
+    `stored` updated with `incoming`: records with the same id are replaced,
+    new ones appended (stored order first). Records are never dropped, since
+    no page deletes shared records. A stored record without an id is replaced
+    by an incoming record that only differs by having been given one.
+    Anything that is not a list of dicts is simply `incoming`.
+    """
+    if not (is_record_list(stored) and is_record_list(incoming)):
+        return incoming
+    newly_keyed = {_content_key(x) for x in incoming if record_key(x)[0] == "id"}
+    merged = OrderedDict()
+    for item in stored:
+        key = record_key(item)
+        if key[0] == "content" and key[1] in newly_keyed:
+            continue
+        merged[key] = item
+    for item in incoming:
+        merged[record_key(item)] = item
+    return list(merged.values())
+
+
+def merge_shared(stored, data):
+    """Shared-state update: list-of-record keys merged with merge_records, other keys replaced."""
+    return {k: merge_records(stored[k], v) if k in stored else v for k, v in data.items()}
+
+
+def fingerprint(value):
+    """Cheap change detector for dirty-key tracking: scalars compare as themselves, containers by JSON digest."""
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return value
+    return hashlib.md5(json.dumps(value).encode("utf-8")).hexdigest()
+
+
+def _read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else None
+    except (OSError, ValueError):
+        return None
+
+
+class JSONSessionStore:
+    """One JSON file per session plus a shared file, written atomically under flock."""
+
+    def __init__(self, root=SESSION_DIR, legacy_file=LEGACY_SESSION_FILE):
+        self.root = root
+        self.legacy_file = legacy_file
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, name):
+        return os.path.join(self.root, f"{name}.json")
+
+    @contextmanager
+    def _locked(self, name, exclusive=True):
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.root, f".{name}.lock"), "a") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def read(self, uid, keys=None):
+        """The session's saved state (only `keys`, if given), or None if it has none (or the uid is invalid)."""
+        if not valid_uid(uid):
+            return None
+        data = _read_json(self._path(uid))
+        if data is not None and keys is not None:
+            data = {k: data[k] for k in keys if k in data}
+        return data
+
+    def keys(self, uid):
+        data = self.read(uid)
+        return None if data is None else set(data)
+
+    def write(self, uid, data):
+        if not valid_uid(uid):
+            raise ValueError(f"Invalid session id: {uid!r}")
+        with self._locked(uid):
+            atomic_write_json(self._path(uid), data)
+
+    def write_keys(self, uid, changed, deleted=()):
+        """Applies changed/deleted keys; a file store still rewrites the whole file."""
+        if not valid_uid(uid):
+            raise ValueError(f"Invalid session id: {uid!r}")
+        with self._locked(uid):
+            data = _read_json(self._path(uid)) or {}
+            data.update(changed)
+            for k in deleted:
+                data.pop(k, None)
+            atomic_write_json(self._path(uid), data)
+
+    def read_shared(self, keys=None):
+        data = _read_json(self._path(SHARED_NAME))
+        if data is None and self.legacy_file:
+            data = _read_json(self.legacy_file)  # pre per-session installs
+        data = data or {}
+        return data if keys is None else {k: data[k] for k in keys if k in data}
+
+    def update_shared(self, data):
+        """Merges `data` into the shared state (read-modify-write under an exclusive lock, see merge_shared)."""
+        with self._locked(SHARED_NAME):
+            merged = _read_json(self._path(SHARED_NAME)) or {}
+            merged.update(merge_shared(merged, data))
+            atomic_write_json(self._path(SHARED_NAME), merged)
+
+
+class SQLiteSessionStore:
+    """
+    Session state in SQLite (WAL): one row per (session, key) holding the
+    key's JSON. Saves upsert only the keys that changed and loads can fetch a
+    subset of keys, so neither touches the rest of the state. Safe to share
+    across threads and processes. The shared state is the SHARED_NAME session.
+    """
+
+    def __init__(self, path=SESSION_DB_FILE, legacy_file=LEGACY_SESSION_FILE):
+        self.path = path
+        self.legacy_file = legacy_file
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._conn().execute(
+            """CREATE TABLE IF NOT EXISTS session_state (
+                session TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                updated REAL NOT NULL,
+                PRIMARY KEY (session, key)
+            ) WITHOUT ROWID"""
+        )
+
+    def _conn(self):
+        # sqlite3 connections are not shareable across threads; keep one per thread.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _select(self, session, keys=None):
+        conn = self._conn()
+        if keys is None:
+            return conn.execute("SELECT key, value FROM session_state WHERE session = ?", (session,)).fetchall()
+        rows, keys = [], list(keys)
+        # Stay well below SQLite's bound-parameter limit.
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            rows += conn.execute(
+                f"SELECT key, value FROM session_state WHERE session = ? AND key IN ({marks})",
+                [session] + chunk,
+            ).fetchall()
+        return rows
+
+    def _exists(self, session):
+        return self._conn().execute("SELECT 1 FROM session_state WHERE session = ? LIMIT 1", (session,)).fetchone() is not None
+
+    def _upsert(self, session, changed, deleted=()):
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO session_state VALUES (?, ?, ?, ?)",
+                [(session, k, json.dumps(v), now) for k, v in changed.items()],
+            )
+            conn.executemany("DELETE FROM session_state WHERE session = ? AND key = ?", [(session, k) for k in deleted])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def read(self, uid, keys=None):
+        """The session's saved state (only `keys`, if given), or None if it has none (or the uid is invalid)."""
+        if not valid_uid(uid) or not self._exists(uid):
+            return None
+        return {k: json.loads(v) for k, v in self._select(uid, keys)}
+
+    def keys(self, uid):
+        """Saved key names, without reading any values; None for an unknown session."""
+        if not valid_uid(uid):
+            return None
+        found = {k for (k,) in self._conn().execute("SELECT key FROM session_state WHERE session = ?", (uid,))}
+        return found or None
+
+    def write(self, uid, data):
+        """Replaces the session's whole state."""
+        stale = (self.keys(uid) or set()) - set(data)
+        self.write_keys(uid, data, stale)
+
+    def write_keys(self, uid, changed, deleted=()):
+        """Upserts `changed` and removes `deleted`; other keys are untouched."""
+        if not valid_uid(uid):
+            raise ValueError(f"Invalid session id: {uid!r}")
+        self._upsert(uid, changed, deleted)
+
+    def read_shared(self, keys=None):
+        rows = self._select(SHARED_NAME, keys)
+        if not rows and self.legacy_file and not self._exists(SHARED_NAME):
+            data = _read_json(self.legacy_file) or {}  # pre per-session installs
+            return data if keys is None else {k: data[k] for k in keys if k in data}
+        return {k: json.loads(v) for k, v in rows}
+
+    def update_shared(self, data):
+        """Merges `data` into the shared state (see merge_shared) in one write transaction."""
+        if not data:
+            return
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            stored = {k: json.loads(v) for k, v in self._select(SHARED_NAME, data)}
+            conn.executemany(
+                "INSERT OR REPLACE INTO session_state VALUES (?, ?, ?, ?)",
+                [(SHARED_NAME, k, json.dumps(v), now) for k, v in merge_shared(stored, data).items()],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_session_store():
+    """Process-wide store for SESSION_BACKEND; falls back to JSON files if the database cannot be opened."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if SESSION_BACKEND == "sqlite":
+                    try:
+                        _store = SQLiteSessionStore()
+                    except (sqlite3.Error, OSError):
+                        _store = JSONSessionStore()
+                else:
+                    _store = JSONSessionStore()
+    return _store
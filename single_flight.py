@@ -0,0 +1,82 @@
+"""
+Single-flight de-duplication of in-flight calls.
+
+st.cache_data only helps once a result is stored; two sessions submitting the
+same resume/JD at the same moment both miss and both run the full analysis.
+Wrapping the function with @single_flight (underneath @st.cache_data) makes
+concurrent callers with identical arguments wait for the first call and share
+its result instead.
+"""
+import copy
+import functools
+import hashlib
+import pickle
+import threading
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "followers")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None   # followers' private copy, never the leader's object
+        self.error = None
+        self.followers = 0
+
+
+def _key(name, args, kwargs):
+    payload = (name, args, sorted(kwargs.items()))
+    try:
+        raw = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        raw = repr(payload).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+def single_flight(func):
+    """Decorator: identical concurrent calls execute `func` once."""
+    in_flight = {}
+    lock = threading.Lock()
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = _key(name, args, kwargs)
+        with lock:
+            call = in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = in_flight[key] = _Call()
+            else:
+                call.followers += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            # Followers get their own copy, as they would from st.cache_data
+            return copy.deepcopy(call.result)
+
+        result = None
+        try:
+            result = func(*args, **kwargs)
+            return result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with lock:
+                in_flight.pop(key, None)
+                followers = call.followers
+            # Copied before followers are released, so the leader may mutate
+            # its result while they copy theirs from this snapshot
+            try:
+                if followers and call.error is None:
+                    call.result = copy.deepcopy(result)
+            except Exception as e:
+                call.error = e
+            finally:
+                call.done.set()
+
+    wrapper.in_flight = lambda: len(in_flight)
+    return wrapper
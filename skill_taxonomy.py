@@ -0,0 +1,118 @@
+"""
+Precomputed embedding matrix for the known skill vocabulary.
+
+Build once (and again whenever the vocabulary or model changes):
+
+    python skill_taxonomy.py --extra path/to/external_taxonomy.txt
+
+At runtime the matrix is memory-mapped, so every known skill is a row lookup
+and only out-of-vocabulary strings ever reach the transformer.
+"""
+import argparse
+import json
+import os
+import threading
+
+import numpy as np
+
+from embedding_store import normalize_skill
+
+TAXONOMY_DIR = os.environ.get("SKILLGAP_TAXONOMY_DIR", "taxonomy")
+MATRIX_FILE = "skill_embeddings.npy"
+IDS_FILE = "skill_ids.json"
+
+
+def collect_vocabulary(extra_paths=()):
+    """Built-in skill lists plus any external taxonomy files, normalized and de-duplicated."""
+    from milestone2 import TECHNICAL_SKILLS, SOFT_SKILLS, SKILL_CATEGORIES
+
+    vocab = list(TECHNICAL_SKILLS) + list(SOFT_SKILLS)
+    for skills in SKILL_CATEGORIES.values():
+        vocab.extend(skills)
+
+    for path in extra_paths:
+        with open(path, "r", encoding="utf-8") as f:
+            if path.lower().endswith(".json"):
+                vocab.extend(json.load(f))
+            else:
+                # Plain text: one skill per line
+                vocab.extend(line for line in f if line.strip())
+
+    return list(dict.fromkeys(normalize_skill(s) for s in vocab if str(s).strip()))
+
+
+def build_taxonomy(out_dir=TAXONOMY_DIR, extra_paths=(), batch_size=256):
+    """Encodes the whole vocabulary and writes the .npy matrix and id table."""
+    from milestone3 import EMBEDDING_MODEL_ID, load_model
+
+    vocab = collect_vocabulary(extra_paths)
+    model = load_model()
+    matrix = np.asarray(
+        model.encode(vocab, batch_size=batch_size, normalize_embeddings=True, show_progress_bar=True),
+        dtype=np.float32,
+    )
+
+    os.makedirs(out_dir, exist_ok=True)
+    np.save(os.path.join(out_dir, MATRIX_FILE), matrix)
+    with open(os.path.join(out_dir, IDS_FILE), "w", encoding="utf-8") as f:
+        json.dump({"model": EMBEDDING_MODEL_ID, "dim": int(matrix.shape[1]), "skills": vocab}, f)
+    return len(vocab)
+
+
+class SkillTaxonomy:
+    """Read-only, memory-mapped view of a built taxonomy."""
+
+    def __init__(self, directory=TAXONOMY_DIR):
+        with open(os.path.join(directory, IDS_FILE), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.model_name = meta["model"]
+        self.skills = meta["skills"]
+        self.index = {s: i for i, s in enumerate(self.skills)}
+        self.matrix = np.load(os.path.join(directory, MATRIX_FILE), mmap_mode="r")
+        if self.matrix.shape[0] != len(self.skills):
+            raise ValueError("Taxonomy matrix and id table are out of sync; rebuild it.")
+
+    def __contains__(self, skill):
+        return normalize_skill(skill) in self.index
+
+    def rows(self, skills):
+        """Row indices for `skills`, -1 where the skill is out of vocabulary."""
+        return np.array([self.index.get(normalize_skill(s), -1) for s in skills], dtype=np.int64)
+
+    def get_many(self, model_name, skills):
+        """Same contract as EmbeddingStore.get_many, served from the mmap."""
+        if model_name != self.model_name:
+            return {}
+        keys = list(dict.fromkeys(normalize_skill(s) for s in skills))
+        hits = [k for k in keys if k in self.index]
+        if not hits:
+            return {}
+        block = np.asarray(self.matrix[[self.index[k] for k in hits]], dtype=np.float32)
+        return dict(zip(hits, block))
+
+
+_taxonomy = None
+_taxonomy_loaded = False
+_taxonomy_lock = threading.Lock()
+
+def get_taxonomy():
+    """Process-wide taxonomy, or None when it has not been built."""
+    global _taxonomy, _taxonomy_loaded
+    if not _taxonomy_loaded:
+        with _taxonomy_lock:
+            if not _taxonomy_loaded:
+                try:
+                    _taxonomy = SkillTaxonomy()
+                except (OSError, ValueError, KeyError):
+                    _taxonomy = None
+                _taxonomy_loaded = True
+    return _taxonomy
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the precomputed skill embedding matrix.")
+    parser.add_argument("--out", default=TAXONOMY_DIR, help="Output directory")
+    parser.add_argument("--extra", action="append", default=[], help="External taxonomy file (.txt one per line, or .json list)")
+    args = parser.parse_args()
+    n = build_taxonomy(args.out, args.extra)
+    print(f"Encoded {n} skills into {os.path.join(args.out, MATRIX_FILE)}")
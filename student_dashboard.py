@@ -4,6 +4,25 @@ import pandas as pd
 import textwrap
 import random
 import time
+import uuid
+
+def rescore_skill_match(resume_text):
+    """
+    Milestone 3's overall skill match for another version of the resume,
+    against the same JD skills, thresholds and critical skills as the stored
+    m3_results. None without Milestone 3 results.
+    """
+    m3 = st.session_state.get("m3_results")
+    if not isinstance(m3, dict) or not m3.get("jd_skills"):
+        return None
+    from analysis_store import get_analysis_store
+    from milestone3 import apply_critical_weighting, compute_similarity_matrix, score_similarity_matrix
+    tech, soft = get_analysis_store().skills(resume_text)
+    r_skills, j_skills = list(dict.fromkeys(tech + soft)), list(m3["jd_skills"])
+    match_thr, partial_thr = m3.get("thresholds", [0.75, 0.5])
+    sim_matrix = compute_similarity_matrix(r_skills, j_skills)
+    _, details, stats = score_similarity_matrix(sim_matrix, r_skills, j_skills, match_thr, partial_thr, m3.get("assignment", "argmax"))
+    return apply_critical_weighting(details, stats, m3.get("critical_skills", []))["overall"]
 
 def app():
     # Helper to check status
@@ -47,7 +66,10 @@ def app():
     components.render_navbar()
     
     if "updated_resume_score" not in st.session_state:
-        st.session_state["updated_resume_score"] = None
+        st.session_state["updated_resume_score"] = None  # M3 skill match of the uploaded version
+    # [old, new] ATS quality of the original and uploaded versions (a separate metric)
+    ats_quality = st.session_state.get("updated_ats_quality")
+    has_update = st.session_state["updated_resume_score"] is not None or bool(ats_quality)
     
     # STUDENT PROFILE HEADER
     original_score = 0
@@ -56,7 +78,7 @@ def app():
             
     # Determine which score to display (Best of Original vs Updated)
     display_score = original_score
-    if st.session_state["updated_resume_score"]:
+    if st.session_state["updated_resume_score"] is not None:
         display_score = max(original_score, st.session_state["updated_resume_score"])
             
     # TITLE & NAV
@@ -329,32 +351,69 @@ def app():
          
     with evo_c2:
         # Upload New Resume Card
-        box_style = "border: 2px dashed #3b82f6; background: rgba(59, 130, 246, 0.05);" if not st.session_state["updated_resume_score"] else "border: 2px solid #10b981; background: rgba(16, 185, 129, 0.05);"
+        box_style = "border: 2px dashed #3b82f6; background: rgba(59, 130, 246, 0.05);" if not has_update else "border: 2px solid #10b981; background: rgba(16, 185, 129, 0.05);"
         
         st.markdown(textwrap.dedent(f"""\
         <div style="padding:25px; border-radius:16px; {box_style} height:100%; transition:all 0.3s;">
              <div style="display:flex; justify-content:space-between; align-items:start;">
                  <div>
-                    <div style="font-weight:700; color:{'#10b981' if st.session_state['updated_resume_score'] else '#3b82f6'}; margin-bottom:5px;">
-                        {'✅ UPDATED VERSION' if st.session_state['updated_resume_score'] else '🚀 UPLOAD NEW VERSION'}
+                    <div style="font-weight:700; color:{'#10b981' if has_update else '#3b82f6'}; margin-bottom:5px;">
+                        {'✅ UPDATED VERSION' if has_update else '🚀 UPLOAD NEW VERSION'}
                     </div>
                  </div>
-                 <div style="font-size:1.5rem;">{'📈' if st.session_state['updated_resume_score'] else '📤'}</div>
+                 <div style="font-size:1.5rem;">{'📈' if has_update else '📤'}</div>
              </div>
         """), unsafe_allow_html=True)
         
-        if st.session_state["updated_resume_score"]:
-            # SHOW RESULT
+        if has_update and st.session_state["updated_resume_score"] is None:
+            st.markdown("""<div style="font-size:0.9rem; color:#94a3b8; margin-bottom:10px;">Skill match unavailable for this version: run the Gap Analysis (Milestone 3) first.</div>""", unsafe_allow_html=True)
+        elif has_update:
+            # SHOW RESULT (colour and message follow the direction of the change)
+            score_delta = st.session_state['updated_resume_score'] - original_score
+            if score_delta > 0:
+                delta_color, delta_bg = "#10b981", "rgba(16,185,129,0.2)"
+                delta_msg = "Great job! Your new resume is optimized for the application."
+            elif score_delta == 0:
+                delta_color, delta_bg = "#94a3b8", "rgba(148,163,184,0.2)"
+                delta_msg = "Same score as the original. Address the missing skills to move it up."
+            else:
+                delta_color, delta_bg = "#ef4444", "rgba(239,68,68,0.2)"
+                delta_msg = "Your new version scores lower than the original. Check what changed below."
             st.markdown(textwrap.dedent(f"""\
-            <div style="font-size:3rem; font-weight:800; color:#10b981; margin-bottom:5px;">
+            <div style="font-size:3rem; font-weight:800; color:{delta_color}; margin-bottom:5px;">
                 {st.session_state['updated_resume_score']}%
-                <span style="font-size:1rem; color:#10b981; vertical-align:middle; background:rgba(16,185,129,0.2); padding:4px 8px; border-radius:12px;">+{st.session_state['updated_resume_score'] - original_score}%</span>
+                <span style="font-size:1rem; color:{delta_color}; vertical-align:middle; background:{delta_bg}; padding:4px 8px; border-radius:12px;">{score_delta:+}%</span>
             </div>
-            <div style="font-size:0.9rem; color:#94a3b8; margin-bottom:20px;">Great job! Your new resume is optimized for the application.</div>
+            <div style="font-size:0.9rem; color:#94a3b8; margin-bottom:20px;">{delta_msg}</div>
             """), unsafe_allow_html=True)
+
+        if has_update:
+            # ATS quality (formatting/content checks) is its own scale, never mixed into the match score
+            if ats_quality:
+                ats_old, ats_new = ats_quality
+                ats_text = f"{ats_old} → {ats_new}" if ats_old is not None else f"{ats_new}"
+                st.caption(f"ATS quality score: {ats_text} / 100")
+
+            # What changed between the original and the updated resume
+            diff = st.session_state.get("resume_diff")
+            if diff:
+                with st.expander(f"🔍 What changed ({len(diff['flipped'])} checks flipped)"):
+                    for f in diff["flipped"]:
+                        st.markdown(f"{'✅' if f['after'] else '❌'} **{f['name']}** — {f['feedback']}")
+                    kw = diff.get("keywords")
+                    if kw:
+                        if kw.get("added"):
+                            st.markdown("**➕ New keywords:** " + ", ".join(kw["added"][:15]))
+                        if kw.get("removed"):
+                            st.markdown("**➖ Dropped keywords:** " + ", ".join(kw["removed"][:15]))
+                        if "coverage_new" in kw:
+                            st.caption(f"JD keyword coverage: {kw['coverage_old']}% → {kw['coverage_new']}%")
+                    st.caption(f"Re-scored {diff['blocks_recomputed']} of {diff['blocks_total']} text blocks in {diff['elapsed_ms']:.0f} ms.")
             
             if st.button("Reset / Upload Different", type="secondary", use_container_width=True):
                 st.session_state["updated_resume_score"] = None
+                st.session_state["updated_ats_quality"] = None
+                st.session_state["resume_diff"] = None
                 st.rerun()
         else:
             # SHOW UPLOADER
@@ -368,11 +427,29 @@ def app():
             if new_resume is not None:
                 if st.button("Analyze & Update Score", type="primary", use_container_width=True):
                     with st.spinner("Parsing new structure... re-evaluating keywords..."):
-                        time.sleep(2) 
-                        improvement = random.randint(10, 25)
-                        new_score = min(98, original_score + improvement)
+                        from milestone1 import parse_file
+                        from ats_diff import ATSDiffer
+                        new_text = parse_file(new_resume)
+                        old_text = st.session_state.get("resume_manual", "") or ""
+                        # Only the blocks that changed since the original resume are re-scored
+                        if not isinstance(st.session_state.get("ats_differ"), ATSDiffer):
+                            st.session_state["ats_differ"] = ATSDiffer()
+                        differ = st.session_state["ats_differ"]
+                        if old_text.strip():
+                            diff = differ.diff(old_text, new_text, st.session_state.get("jd_manual", ""))
+                            ats_quality = [diff["score_old"], diff["score_new"]]
+                        else:
+                            diff = None
+                            ats_quality = [None, differ.snapshot(new_text)["score"]]
+                        try:
+                            new_score = rescore_skill_match(new_text)
+                        except Exception:
+                            new_score = None  # NLP stack unavailable: the ATS quality figure still shows
                         st.session_state["updated_resume_score"] = new_score
-                        st.balloons()
+                        st.session_state["updated_ats_quality"] = ats_quality
+                        st.session_state["resume_diff"] = diff
+                        if new_score is not None and new_score > original_score:
+                            st.balloons()
                         st.rerun()
 
         st.markdown("</div>", unsafe_allow_html=True)
@@ -604,7 +681,19 @@ def app():
                                      score_to_use = st.session_state["updated_resume_score"]
                                      used_updated = True
                                  
+                                 # Document-level fit gives HR a ranking signal beyond skill overlap.
+                                 # Optional: a missing/cold model must never block or fail the application.
+                                 doc_fit = None
+                                 resume_text = st.session_state.get("resume_manual", "")
+                                 if resume_text and job.get("description"):
+                                     try:
+                                         from document_similarity import document_fit
+                                         doc_fit = document_fit(resume_text, job["description"])
+                                     except Exception:
+                                         doc_fit = None
+
                                  new_app = {
+                                     "_id": str(uuid.uuid4()),  # Shared records are merged by id across sessions
                                      "job_id": job['id'],
                                      "job_role": job['role'],
                                      "applicant": "Alamanda Balu Karthik",
@@ -612,7 +701,9 @@ def app():
                                      "status": "Pending",
                                      "applied_at": "Just now",
                                      "resume_version": "Updated v2.0" if used_updated else "Original v1.0",
-                                     "company": job['company']
+                                     "company": job['company'],
+                                     "skills": list(m2_skills),
+                                     "doc_similarity": doc_fit
                                  }
                                  st.session_state.setdefault("applications", []).append(new_app)
                                  components.save_progress()
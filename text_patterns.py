@@ -0,0 +1,91 @@
+"""
+Shared, precompiled text patterns.
+
+Contact, metric, section and tokenizer regexes used across pages live here so
+they are compiled once at import instead of being redefined (and sometimes
+run twice) inside each analysis function. `extract_entities` returns every
+email / phone / metric match with its character offsets in one call.
+"""
+import re
+
+EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+# ATS phone pattern: loose, so matches are validated to at least 10 digits
+PHONE_RE = re.compile(r'(\+?\d{1,3}[-.\s]?)?(\(?\d{3}\)?[-.\s]?)?\d{3}[-.\s]?\d{4}')
+# Stricter North-American style pattern used by the Milestone 1 health check
+PHONE_BASIC_RE = re.compile(r'(\+\d{1,2}\s?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}')
+METRIC_RE = re.compile(r'(\d+(?:,\d+)*(?:\.\d+)?\s*(%|\$|M|K|\+|k|m))')
+NUMBER_RE = re.compile(r'\d+%|\d+')
+NON_DIGIT_RE = re.compile(r'\D')
+DIGIT_RE = re.compile(r'\d')
+
+# extract_entities' single pass: one alternation, dispatched on m.lastgroup.
+# At a given position email wins over metric over phone, so a long number
+# with a unit ("2500000+") is a metric rather than a rejected phone.
+ENTITY_RE = re.compile(
+    r'(?P<email>[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
+    r'|(?P<metric>\d+(?:,\d+)*(?:\.\d+)?\s*(?:%|\$|M|K|\+|k|m))'
+    r'|(?P<phone>(?:\+?\d{1,3}[-.\s]?)?(?:\(?\d{3}\)?[-.\s]?)?\d{3}[-.\s]?\d{4})'
+)
+
+WORD_RE = re.compile(r'\w+')
+WHITESPACE_RE = re.compile(r'\s+')
+SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+
+SECTION_PATTERNS = {
+    "Experience": re.compile(r"(work|professional|relevant|industry)\s+experience|employment\s+history|work\s+history"),
+    "Education": re.compile(r"education|academic|qualification|university"),
+    "Skills": re.compile(r"skills|technical\s+skills|expertise|competencies|technologies"),
+    "Projects": re.compile(r"projects|portfolio|personal\s+projects"),
+}
+
+GITHUB_URL_RE = re.compile(r"^(https?://)?(www\.)?github\.com/[A-Za-z0-9_.-]+/?$")
+LINKEDIN_URL_RE = re.compile(r"^(https?://)?(www\.)?linkedin\.com/in/[A-Za-z0-9_-]+/?$")
+
+MIN_PHONE_DIGITS = 10
+
+
+class Span:
+    """A match: kind ('email' | 'phone' | 'metric'), text and [start, end) offsets."""
+    __slots__ = ("kind", "text", "start", "end")
+
+    def __init__(self, kind, text, start, end):
+        self.kind = kind
+        self.text = text
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        return f"Span({self.kind!r}, {self.text!r}, {self.start}, {self.end})"
+
+
+def extract_entities(text):
+    """
+    {"email": [Span], "phone": [Span], "metric": [Span]} in document order,
+    from a single ENTITY_RE pass (skipped when the text has neither '@' nor
+    a digit). Matches do not overlap. Phone matches with fewer than
+    MIN_PHONE_DIGITS digits are dropped, and metrics inside them are kept;
+    phone spans are whitespace-trimmed.
+    """
+    found = {"email": [], "phone": [], "metric": []}
+    if not text or ("@" not in text and not DIGIT_RE.search(text)):
+        return found
+
+    for m in ENTITY_RE.finditer(text):
+        kind, raw = m.lastgroup, m.group(0)
+        if kind != "phone":
+            found[kind].append(Span(kind, raw, m.start(), m.end()))
+        elif len(NON_DIGIT_RE.sub('', raw)) >= MIN_PHONE_DIGITS:
+            lead = len(raw) - len(raw.lstrip())
+            stripped = raw.strip()
+            found["phone"].append(Span("phone", stripped, m.start() + lead, m.start() + lead + len(stripped)))
+        else:
+            # Not a phone after all, but a metric may start inside it ("123 4567%")
+            for x in METRIC_RE.finditer(text, m.start() + 1):
+                if x.start() >= m.end():
+                    break
+                found["metric"].append(Span("metric", x.group(0), x.start(), x.end()))
+    return found
+
+
+def first_text(spans, default="N/A"):
+    return spans[0].text if spans else default